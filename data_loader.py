@@ -20,20 +20,47 @@ Integration:
 import os
 import json
 import logging
-from typing import Union, Any, Dict, List, Tuple
+import time
+import threading
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Union, Any, Dict, List, Tuple, Optional, Iterable, Iterator, Callable, Set
 from datetime import datetime
 from dataclasses import asdict
 
+import pandas as pd
+
+# terminusdb_client (and requests, which it pulls in) is imported lazily in the
+# methods that need it; importing it costs hundreds of ms on startup
+if TYPE_CHECKING:
+    from terminusdb_client import WOQLClient
+
 try:
-    from terminusdb_client import WOQLClient, WOQLQuery, GraphType
+    import orjson
 except ImportError:
-    raise ImportError("TerminusDB client library is not installed. Install it using: pip install terminusdb-client")
+    orjson = None  # fall back to the stdlib json encoder
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 from data_model import Postcode, ProviderZone, ProviderZoneRoute, GraphIndex
 
 logging.basicConfig(level=logging.INFO)
 logger =logging.getLogger(__name__)
 
+# Default number of documents per insert_document call (override with TDB_BATCH_SIZE)
+DEFAULT_BATCH_SIZE = 500
+
+# Upper bound on concurrent per-provider insert workers (override with TDB_MAX_WORKERS)
+DEFAULT_MAX_WORKERS = 8
+
+# Below this many rows, building documents in-process beats the Pool's pickling overhead
+PARALLEL_DOC_THRESHOLD = 50_000
+PARALLEL_DOC_CHUNKSIZE = 1000
+
+# Seconds a fetched database listing is reused before asking the server again
+DB_LIST_TTL = 60
+
 class TerminusDBLoader:
     """
     Manages TerminusDB graph operations for freight network data.
@@ -50,7 +77,9 @@ class TerminusDBLoader:
         db_name: str = "freight_poc",
         username: str = "admin",
         password: str = "root",
-        use_rdbms: bool = False):
+        use_rdbms: bool = False,
+        batch_size: Optional[int] = None,
+        fast_ingest: bool = False):
         """
         Initialize TerminusDB client.
 
@@ -60,22 +89,63 @@ class TerminusDBLoader:
             username: Authentication username
             password: Authentication password
             use_rdbms: If True, load from SQL Server; if False, use PoC data
+            batch_size: Documents per insert commit (default: $TDB_BATCH_SIZE or 500)
+            fast_ingest: If True, write each load as a single commit (one fsync) instead of
+                one commit per batch. Only safe for rebuildable loads (e.g. force_recreate)
         """
 
         self.serverURL = server_url
         self.dbName = db_name
         self.userRDBMS = use_rdbms
+        self.username = username
+        self.password = password
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("TDB_BATCH_SIZE", str(DEFAULT_BATCH_SIZE)))
+        if self.batch_size <= 0:
+            raise ValueError(f"batch_size must be a positive integer, got {self.batch_size}")
+        self.max_workers = int(os.getenv("TDB_MAX_WORKERS", str(DEFAULT_MAX_WORKERS)))
+        self.fast_ingest = fast_ingest
 
         # Initialize TerminusDB client
-        if WOQLClient is None:
-            raise ImportError("TerminusDB client library is not installed.")
-        
+        try:
+            from terminusdb_client import WOQLClient
+        except ImportError:
+            raise ImportError("TerminusDB client library is not installed. Install it using: pip install terminusdb-client")
+
+        # One persistent client per loader; the lock guards reconnects
+        self._client_lock = threading.Lock()
+        self._db_names: Optional[Set[str]] = None
+        self._db_names_ts = 0.0
         self.client = WOQLClient(server_url=self.serverURL)
         try:
-            self.client.connect(user=username, password=password)
+            self._connect(self.client)
             logger.info(f"Connected to TerminusDB at {self.serverURL} as {username}")
         except Exception as e:
             logger.warning(f"Could not connect to TerminusDB: {e}")
+
+    def _connect(self, client: "WOQLClient") -> None:
+        """Connect client to the loader's database, or to the server if the DB does not exist yet."""
+        try:
+            client.connect(user=self.username, password=self.password, db=self.dbName)
+        except Exception:
+            client.connect(user=self.username, password=self.password)
+
+    def _get_client(self, reconnect: bool = False) -> "WOQLClient":
+        """
+        Return the persistent client.
+
+        Args:
+            reconnect: If True, re-open the session (after a dropped connection)
+        """
+        with self._client_lock:
+            if reconnect:
+                logger.info(f"Reconnecting to TerminusDB at {self.serverURL}")
+                self._connect(self.client)
+            return self.client
+
+    def close(self) -> None:
+        """Close the persistent TerminusDB connection."""
+        with self._client_lock:
+            self.client.close()
     
     def create_database(self, force_recreate: bool = False) -> bool:
         """
@@ -89,13 +159,13 @@ class TerminusDBLoader:
         """
         try:
             # Check if database exists
-            databases = self.client.get_databases()
-            db_exists = any(db["name"] == self.dbName for db in databases)
+            db_exists = self.dbName in self._list_databases()
 
             if db_exists:
                 if force_recreate:
                     logger.info(f"Database {self.dbName} exists. Deleting for recreation.")
                     self.client.delete_database(self.dbName)
+                    self._db_names = None
                     db_exists = False
                 else:
                     logger.info(f"Database {self.dbName} already exists. Validating schema.")
@@ -105,6 +175,7 @@ class TerminusDBLoader:
             if not db_exists:
                 logger.info(f"Creating database {self.dbName}.")
                 self.client.create_database(self.dbName, label="Freight Recommendation Engine PoC", description="Graph DB for freight network data")
+                self._db_names = None
                 logger.info(f"Database {self.dbName} created successfully.")
                 return True
         except Exception as e:
@@ -112,6 +183,14 @@ class TerminusDBLoader:
             raise 
         return False
 
+    def _list_databases(self) -> Set[str]:
+        """Names of databases on the server, cached for DB_LIST_TTL seconds."""
+        now = time.monotonic()
+        if self._db_names is None or now - self._db_names_ts > DB_LIST_TTL:
+            self._db_names = {db["name"] for db in self.client.get_databases()}
+            self._db_names_ts = now
+        return self._db_names
+
     def createSchema(self) -> bool:
         """
         Create TerminusDB schema for freight network.
@@ -120,11 +199,15 @@ class TerminusDBLoader:
         - Postcode: Australian postcode (vertex)
         - ProviderZone: Provider-specific delivery zone (vertex)
         - ProviderZoneRoute: Delivery route between zones (edge)
-        - ZoneProviderAssociation: Maps postcodes to zones
+
+        Zone membership (postcode -> zone) is not stored in TerminusDB; the
+        in-memory GraphIndex built by _build_graph_index is its source of truth.
 
         Returns:
             True if schema created successfully
         """
+        from terminusdb_client import GraphType
+
         try:
             logger.info("Creating graph schema...")
             
@@ -151,8 +234,7 @@ class TerminusDBLoader:
                     "provider_id": "xsd:string",
                     "zone_name": "xsd:string",
                     "state": "xsd:string",
-                    "category": "xsd:string",
-                    "postcodes": { "@type": "Set", "@class": "xsd:string" } 
+                    "category": "xsd:string"
                 },
                 {
                     "@type": "Class",
@@ -184,13 +266,36 @@ class TerminusDBLoader:
         """
         Generate and load PoC sample data into TerminusDB.
 
+        Returns:
+            Tuple of (graph_index_dict, postcodes, zones, routes, graph_index), as sample_data
+        """
+        graph_index_dict, postcodes, provider_zones, routes, graph_index = self.sample_data()
+
+        # Ensure Database and Schema exist before inserting!
+        # force_recreate=True ensures we connect to the specific DB context cleanly
+        logger.info("Initializing Database and Schema...")
+        self.create_database(force_recreate=True)
+        self.createSchema()
+
+        # Insert data into TerminusDB
+        logger.info(f"Inserting {len(postcodes)} postcodes, {len(provider_zones)} zones, {len(routes)} routes...")
+        self._insert_data(postcodes, provider_zones, routes)
+
+        logger.info("PoC data loaded successfully")
+        return graph_index_dict, postcodes, provider_zones, routes, graph_index
+
+    @staticmethod
+    def sample_data() -> Tuple[Dict, List[Postcode], List[ProviderZone], List[ProviderZoneRoute], GraphIndex]:
+        """
+        Generate the PoC sample network in memory, without touching TerminusDB.
+
         Data includes:
         - 10 Australian postcodes
         - 5 freight providers with 4 zones each
         - 40 zone-to-zone routes with pricing/ETD
 
         Returns:
-            Tuple of (graph_index_dict, postcodes, zones, routes)
+            Tuple of (graph_index_dict, postcodes, zones, routes, graph_index)
         """
         logger.info("Generating PoC sample data...")
 
@@ -208,16 +313,17 @@ class TerminusDBLoader:
             {"code": "6000", "suburb": "Perth CBD", "state": "WA"},
         ]
 
-        postcodes: List[Postcode] = []
-        for pc in postcodes_data:
-            p = Postcode(code=pc["code"], suburb=pc["suburb"], state=pc["state"])
-            postcodes.append(p)
-            logger.debug(f"Generated Postcode: {asdict(p)}")
+        postcodes: List[Postcode] = [
+            Postcode(code=pc["code"], suburb=pc["suburb"], state=pc["state"])
+            for pc in postcodes_data
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for p in postcodes:
+                logger.debug("Generated Postcode: %s", p)
         
         # Sample providers with zones
         providers = ["FP_1", "FP_2", "FP_3", "FP_4", "FP_5"]
 
-        provider_zones: List[ProviderZone] = []
         zone_templates = {
             "FP_1": [
                 ("SYD_CBD", ["2000", "2001"], "metro"),
@@ -251,21 +357,22 @@ class TerminusDBLoader:
             ],
         }
 
-        for provider_id, zones in zone_templates.items():
-            for zone_name, postcodes_in_zone, service_type in zones:
-                pz = ProviderZone(
-                    providerId=provider_id,
-                    zoneCode=zone_name,
-                    state="NSW",
-                    postcodes=postcodes_in_zone,
-                    category=service_type
-                )
-                provider_zones.append(pz)
-                logger.debug(f"Added zone: {provider_id}/{zone_name}")
+        provider_zones: List[ProviderZone] = [
+            ProviderZone(
+                providerId=provider_id,
+                zoneCode=zone_name,
+                state="NSW",
+                postcodes=postcodes_in_zone,
+                category=service_type
+            )
+            for provider_id, zones in zone_templates.items()
+            for zone_name, postcodes_in_zone, service_type in zones
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for pz in provider_zones:
+                logger.debug("Added zone: %s/%s", pz.providerId, pz.zoneCode)
 
         # Sample routes with pricing/ETD
-        routes: List[ProviderZoneRoute] = []
-
         # FP_1 routes (NSW)
         fp1_routes = [
             ("FP_1", "SYD_CBD", "SYD_INNER", 15.0, 0.5, 2.0, 1000),
@@ -308,9 +415,9 @@ class TerminusDBLoader:
 
         all_routes = fp1_routes + fp2_routes + fp3_routes + fp4_routes + fp5_routes
 
-        for provider_id, from_zone, to_zone, base_cost, cost_per_kg, etd_hours, max_weight_kg in all_routes:
-            # You may need to adjust how serviceType is determined; here we use an empty string as a placeholder
-            route = ProviderZoneRoute(
+        # You may need to adjust how serviceType is determined; here we use an empty string as a placeholder
+        routes: List[ProviderZoneRoute] = [
+            ProviderZoneRoute(
                 providerId=provider_id,
                 fromZone=from_zone,
                 toZone=to_zone,
@@ -319,142 +426,250 @@ class TerminusDBLoader:
                 perKGRate=cost_per_kg,
                 minCharge=base_cost,  # Or set to a different value if needed
                 deliveryHrs=etd_hours,
-                maxMass=max_weight_kg
+                maxMass=float(max_weight_kg)
             )
-            routes.append(route)
-            logger.debug(f"Added route: {provider_id} {from_zone} -> {to_zone} (${base_cost})")
-
-        # Ensure Database and Schema exist before inserting!
-        # force_recreate=True ensures we connect to the specific DB context cleanly
-        logger.info("Initializing Database and Schema...")
-        self.create_database(force_recreate=True)
-        self.createSchema()
-
-        # Insert data into TerminusDB
-        logger.info(f"Inserting {len(postcodes)} postcodes, {len(provider_zones)} zones, {len(routes)} routes...")
-        self._insert_data(postcodes, provider_zones, routes)
+            for provider_id, from_zone, to_zone, base_cost, cost_per_kg, etd_hours, max_weight_kg in all_routes
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for r in routes:
+                logger.debug("Added route: %s %s -> %s ($%s)", r.providerId, r.fromZone, r.toZone, r.baseCharge)
 
         # Build graph index
-        graph_index_dict = self._build_graph_index(postcodes, provider_zones, routes)
-        aggregated_routes = graph_index_dict['zone_routes_map']
+        graph_index_dict = TerminusDBLoader._build_graph_index(postcodes, provider_zones, routes)
 
-        # Group zones by ProviderID for GraphIndex
-        zones_by_provider = {}
-        for z in provider_zones:
-            if z.providerId not in zones_by_provider:
-                zones_by_provider[z.providerId] = []
-            zones_by_provider[z.providerId].append(z)
-
-        logger.info("PoC data loaded successfully")
         return graph_index_dict, postcodes, provider_zones, routes, GraphIndex(
             postcodes=postcodes,
-            providerZones=zones_by_provider,
-            zoneRoutes=aggregated_routes
+            providerZones=graph_index_dict['zones_by_provider'],
+            zoneRoutes=graph_index_dict['zone_routes_map']
         )
 
     def _insert_data(self, postcodes: List[Postcode], provider_zones: List[ProviderZone], routes: List[ProviderZoneRoute]) -> None:
-        """Insert data into TerminusDB using JSON documents."""
+        """
+        Insert data into TerminusDB using JSON documents.
+
+        Documents are partitioned by provider (postcodes share one partition) and
+        each partition is loaded by its own worker. Provider zone graphs are
+        disjoint, so partitions never write the same document.
+        """
         try:
-            # Prepare JSON-LD documents
-            documents = []
-
-            # Add Postcodes
-            for pc in postcodes:
-                doc = {
-                    "@type": "Postcode",
-                    "@id": f"Postcode/{pc.code}", 
-                    "code": pc.code,
-                    "suburb": pc.suburb,
-                    "state": pc.state
-                }
-                documents.append(doc)
-            
-            # Add ProviderZones
-            for zone in provider_zones:
-                doc = {
-                    "@type": "ProviderZone",
-                    "@id": f"ProviderZone/{zone.providerId}_{zone.zoneCode}",
-                    "provider_id": zone.providerId,
-                    "zone_name": zone.zoneCode,
-                    "state": zone.state,
-                    "postcodes": zone.postcodes,
-                    "category": zone.category
-                }
-                documents.append(doc)
-            
-            # Add ProviderZoneRoutes
-            for route in routes:
-                doc = {
-                    "@type": "ProviderZoneRoute",
-                    "@id": f"ProviderZoneRoute/{route.providerId}_{route.fromZone}_{route.toZone}",
-                    "provider_id": route.providerId,
-                    "from_zone": route.fromZone,
-                    "to_zone": route.toZone,
-                    "service_type": route.serviceType,
-                    "base_cost": float(route.baseCharge),
-                    "cost_per_kg": float(route.perKGRate),
-                    "min_charge": float(route.minCharge),
-                    "etd_hours": float(route.deliveryHrs),
-                    "max_weight_kg": float(route.maxMass),
-                    # Ensure these extra fields are included to match new Schema
-                    "max_cbm": float(route.maxCBM),
-                    "max_pallets": int(route.maxPallets),
-                    "reliability_score": float(route.reliabilityScore),
-                    "fuel_levy_pct": float(route.fuelLevyPct)
-                }
-                documents.append(doc)
-            
-            # Bulk insert documents
-            for doc in documents:
-                self.client.insert_document(doc)
-            logger.info(f"Inserted {len(documents)} documents into TerminusDB")
+            # Prepare JSON-LD documents, partitioned by provider
+            partitions: Dict[str, List[Dict]] = defaultdict(list)
+            partitions["postcodes"] = self._build_documents(postcodes, self._postcode_doc)
+            for zone, doc in zip(provider_zones, self._build_documents(provider_zones, self._zone_doc)):
+                partitions[zone.providerId].append(doc)
+            for route, doc in zip(routes, self._build_documents(routes, self._route_doc)):
+                partitions[route.providerId].append(doc)
+
+            if self.fast_ingest:
+                # One logical commit for the whole load
+                documents = [doc for docs in partitions.values() for doc in docs]
+                self._flush_batch(documents, 0)
+                logger.info(f"Inserted {len(documents)} documents into TerminusDB (single commit)")
+                return
+
+            workers = min(len(partitions), self.max_workers)
+            if workers <= 1:
+                counts = [self._insert_partition(docs, self.client) for docs in partitions.values()]
+            else:
+                # TerminusDB clients are not thread-safe: every worker opens its own
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    counts = list(executor.map(self._insert_partition, partitions.values()))
+            logger.info(f"Inserted {sum(counts)} documents into TerminusDB ({len(partitions)} partitions, {workers} workers)")
         except Exception as e:
             logger.error(f"Error inserting data into TerminusDB: {e}")
             raise
+
+    @staticmethod
+    def _build_documents(items: List[Any], to_document: Callable[[Any], Dict]) -> List[Dict]:
+        """
+        Convert items to JSON-LD documents, fanning out to a process pool for large inputs.
+
+        Document construction is pure-Python object building (GIL-bound), so a
+        process pool rather than threads is needed to use more than one core.
+        """
+        workers = os.cpu_count() or 1
+        if len(items) < PARALLEL_DOC_THRESHOLD or workers < 2:
+            return [to_document(item) for item in items]
+        with multiprocessing.Pool(workers) as pool:
+            return pool.map(to_document, items, chunksize=PARALLEL_DOC_CHUNKSIZE)
+
+    def _insert_partition(self, documents: List[Dict], client: Optional["WOQLClient"] = None) -> int:
+        """
+        Insert one partition in bounded batches (one HTTP round-trip + commit per batch).
+
+        Without a client, a dedicated one is opened for this partition and
+        closed once it is done.
+        """
+        owned = client is None
+        if owned:
+            client = self._new_client()
+        try:
+            for i in range(0, len(documents), self.batch_size):
+                self._flush_batch(documents[i:i + self.batch_size], i, client)
+        finally:
+            if owned:
+                client.close()
+        return len(documents)
+
+    def _new_client(self) -> "WOQLClient":
+        """Open a dedicated client connected to this loader's database."""
+        from terminusdb_client import WOQLClient
+        client = WOQLClient(server_url=self.serverURL)
+        self._connect(client)
+        return client
+
+    def _insert_data_stream(self, items: Iterable[Any], to_document: Callable[[Any], Dict], sink: Optional[List] = None) -> int:
+        """
+        Insert documents as they are produced, flushing every batch_size documents.
+
+        Args:
+            items: Iterable of dataclass objects (typically a streaming RDBMS generator)
+            to_document: Converts an item into its JSON-LD document
+            sink: Optional list that collects the items for in-memory indexing
+
+        Returns:
+            Number of documents inserted
+        """
+        batch = []
+        count = 0
+        try:
+            for item in items:
+                if sink is not None:
+                    sink.append(item)
+                batch.append(to_document(item))
+                if len(batch) >= self.batch_size:
+                    self._flush_batch(batch, count)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self._flush_batch(batch, count)
+                count += len(batch)
+        except Exception as e:
+            logger.error(f"Error streaming data into TerminusDB: {e}")
+            raise
+        return count
+
+    def _flush_batch(self, batch: List[Dict], offset: int, client: Optional["WOQLClient"] = None) -> None:
+        """Insert one batch of documents and log its throughput."""
+        from terminusdb_client import GraphType
+
+        client = client or self.client
+        start = time.perf_counter()
+        client.insert_document(batch, commit_msg=f"batch {offset}", graph_type=GraphType.INSTANCE)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Inserted batch {offset}-{offset + len(batch)} ({len(batch) / elapsed if elapsed else 0:.0f} docs/s)")
+
+    @staticmethod
+    def _postcode_doc(pc: Postcode) -> Dict:
+        return {
+            "@type": "Postcode",
+            "@id": f"Postcode/{pc.code}", 
+            "code": pc.code,
+            "suburb": pc.suburb,
+            "state": pc.state
+        }
+
+    @staticmethod
+    def _zone_doc(zone: ProviderZone) -> Dict:
+        return {
+            "@type": "ProviderZone",
+            "@id": f"ProviderZone/{zone.providerId}_{zone.zoneCode}",
+            "provider_id": zone.providerId,
+            "zone_name": zone.zoneCode,
+            "state": zone.state,
+            "category": zone.category
+        }
+
+    @staticmethod
+    def _route_doc(route: ProviderZoneRoute) -> Dict:
+        # Numeric fields are normalised to float/int when the route is built
+        # (see _iter_routes), so no per-document casts are needed here
+        return {
+            "@type": "ProviderZoneRoute",
+            "@id": f"ProviderZoneRoute/{route.providerId}_{route.fromZone}_{route.toZone}",
+            "provider_id": route.providerId,
+            "from_zone": route.fromZone,
+            "to_zone": route.toZone,
+            "service_type": route.serviceType,
+            "base_cost": route.baseCharge,
+            "cost_per_kg": route.perKGRate,
+            "min_charge": route.minCharge,
+            "etd_hours": route.deliveryHrs,
+            "max_weight_kg": route.maxMass,
+            # Ensure these extra fields are included to match new Schema
+            "max_cbm": route.maxCBM,
+            "max_pallets": route.maxPallets,
+            "reliability_score": route.reliabilityScore,
+            "fuel_levy_pct": route.fuelLevyPct
+        }
     
-    def _build_graph_index(self, postcodes: List[Postcode], provider_zones: List[ProviderZone], routes: List[ProviderZoneRoute]) -> Dict:
+    @staticmethod
+    def _build_graph_index(postcodes: List[Postcode], provider_zones: List[ProviderZone], routes: List[ProviderZoneRoute]) -> Dict:
         """Build in-memory GraphIndex from loaded data."""
 
         # Build Postcode Map
         postcode_map = {pc.code: pc for pc in postcodes}
 
+        # Group with pandas so the aggregation runs in C rather than Python loops
+        zone_df = pd.DataFrame({
+            "providerId": [z.providerId for z in provider_zones],
+            "zone_key": [f"{z.providerId}/{z.zoneCode}" for z in provider_zones],
+            "postcodes": [z.postcodes for z in provider_zones],
+            "zone": pd.Series(provider_zones, dtype=object),
+        })
+        route_df = pd.DataFrame({
+            "key": [f"{r.providerId}/{r.fromZone}" for r in routes],
+            "route": pd.Series(routes, dtype=object),
+        })
+
         # Build ProviderZone Map
-        zones_by_provider = {}
+        zones_by_provider = zone_df.groupby("providerId", sort=False)["zone"].agg(list).to_dict()
 
-        for z in provider_zones:
-            if z.providerId not in zones_by_provider:
-                zones_by_provider[z.providerId] = []
-            zones_by_provider[z.providerId].append(z)
-        
         # Build Route Graph
-        provider_graph = {}
-        for route in routes:
-            key = f"{route.providerId}/{route.fromZone}"
-            if key not in provider_graph:
-                provider_graph[key] = []
-            provider_graph[key].append(route)
+        provider_graph = route_df.groupby("key", sort=False)["route"].agg(list).to_dict()
 
         # Build postcode to zones mapping
-        pc_to_zones = {}
-        for zone in provider_zones:
-            for pc in zone.postcodes:
-                if pc not in pc_to_zones:
-                    pc_to_zones[pc] = []
-                pc_to_zones[pc].append(f"{zone.providerId}/{zone.zoneCode}")
-        
-        # Construct GraphIndex dict
-        graph_index = GraphIndex(postcodes=postcodes, providerZones=zones_by_provider, zoneRoutes=provider_graph)
-        
+        pc_to_zones = zone_df.explode("postcodes").groupby("postcodes", sort=False)["zone_key"].agg(list).to_dict()
+
+        # Construct GraphIndex dict (callers build the GraphIndex itself from it)
         logger.info(f"Built GraphIndex with {len(postcode_map)} postcodes, "f"{len(zones_by_provider)} zones, {len(routes)} routes")
         return {
-            "postcodes": {k: v.__dict__ for k, v in postcode_map.items()},
-            "provider_zones": {k: [z.__dict__ for z in v ]for k, v in zones_by_provider.items()},
-            "routes": [r.__dict__ for r in routes],
+            "postcodes": {k: asdict(v) for k, v in postcode_map.items()},
+            "provider_zones": {k: [asdict(z) for z in v ]for k, v in zones_by_provider.items()},
+            "routes": [asdict(r) for r in routes],
             "zone_routes_map": provider_graph,
+            "zones_by_provider": zones_by_provider,
             "pc_to_zones": pc_to_zones,
             "timestamp": datetime.now().isoformat()
         }
 
+    def bulk_load(self, force_recreate: bool = True) -> Tuple[Dict, GraphIndex]:
+        """
+        Create the database, install the schema and load RDBMS data into it.
+
+        The schema is installed before any instance data: TerminusDB does not
+        reliably accept a schema graph on a database created schema-free, so
+        it is not deferred. A schema that fails to install on a new database
+        aborts the load.
+        PoC mode (use_rdbms=False) uses the load_sample_data path.
+
+        Args:
+            force_recreate: If True, delete existing DB and recreate
+
+        Returns:
+            Tuple of (graph_index_dict, GraphIndex)
+        """
+        if not self.userRDBMS:
+            graph_index_dict, _, _, _, graph_index = self.load_sample_data()
+            return graph_index_dict, graph_index
+
+        # A database kept from an earlier load (force_recreate=False) keeps its schema
+        reuse = not force_recreate and self.dbName in self._list_databases()
+        self.create_database(force_recreate=force_recreate)
+        if not reuse and not self.createSchema():
+            raise RuntimeError(f"Could not install the schema on {self.dbName}; aborting bulk load")
+        return self.load_from_rdbms()
+
     def load_from_rdbms(self) -> Tuple[Dict, GraphIndex]:
         """
         Load freight network data from SQL Server RDBMS.
@@ -482,84 +697,100 @@ class TerminusDBLoader:
         cursor = conn.cursor()
 
         try:
-            # Load postcodes
-            cursor.execute("SELECT PostalCode, Suburb, State FROM fpzones")
-            postcodes = [
-                Postcode(code=row[0], suburb=row[1], state=row[2])
-                for row in cursor.fetchall()
-            ]
-            logger.info(f"Loaded {len(postcodes)} postcodes from RDBMS")
-
-            # Load provider zones
-            cursor.execute("""
-                SELECT provider_id, zone_name, service_type, 
-                       STRING_AGG(postal_code, ',') as postcodes
-                FROM fp_pricing_rules
-                GROUP BY provider_id, zone_name, service_type
-            """)
-            provider_zones = [
-                ProviderZone(
-                    providerId=row[0],
-                    zoneCode=row[1],
-                    category=row[2],
-                    state="NSW",
-                    postcodes=row[3].split(',')
-                )
-                for row in cursor.fetchall()
-            ]
-            logger.info(f"Loaded {len(provider_zones)} provider zones from RDBMS")
-
-            # Load routes with pricing/timing
-            cursor.execute("""
-                SELECT 
-                    p.provider_id, p.from_zone, p.to_zone,
-                    c.base_cost, c.cost_per_kg,
-                    e.etd_hours,
-                    v.max_weight_kg
-                FROM fp_pricing_rules p
-                JOIN fpcosts c ON p.route_id = c.route_id
-                JOIN fpserviceetds e ON p.route_id = e.route_id
-                JOIN fpvehicles v ON p.provider_id = v.provider_id
-            """)
-            routes = [
-                ProviderZoneRoute(
-                    providerId=row[0],
-                    fromZone=row[1],
-                    toZone=row[2],
-                    serviceType="",  # Set appropriately if available from your data
-                    baseCharge=float(row[3]),
-                    perKGRate=float(row[4]),
-                    minCharge=float(row[3]),  # Or set to a different value if needed
-                    deliveryHrs=float(row[5]),
-                    maxMass=float(row[6])
-                )
-                for row in cursor.fetchall()
-            ]
-            logger.info(f"Loaded {len(routes)} routes from RDBMS")
+            if self.fast_ingest:
+                # Read everything first, then write it in one final commit
+                postcodes = list(self._iter_postcodes(cursor))
+                provider_zones = list(self._iter_zones(cursor))
+                routes = list(self._iter_routes(cursor))
+                logger.info(f"Loaded {len(postcodes)} postcodes, {len(provider_zones)} provider zones, {len(routes)} routes from RDBMS")
+                self._insert_data(postcodes, provider_zones, routes)
+            else:
+                # Stream rows from SQL Server straight into TerminusDB batches.
+                # Dataclass objects are still collected for the in-memory GraphIndex.
+                logger.info("Streaming RDBMS data into TerminusDB...")
+                postcodes: List[Postcode] = []
+                self._insert_data_stream(self._iter_postcodes(cursor), self._postcode_doc, sink=postcodes)
+                logger.info(f"Loaded {len(postcodes)} postcodes from RDBMS")
 
-            # Build graph index
-            graph_index_dict = self._build_graph_index(postcodes, provider_zones, routes)
-            aggregated_routes = graph_index_dict['zone_routes_map']
+                provider_zones: List[ProviderZone] = []
+                self._insert_data_stream(self._iter_zones(cursor), self._zone_doc, sink=provider_zones)
+                logger.info(f"Loaded {len(provider_zones)} provider zones from RDBMS")
 
-            # Insert into TerminusDB
-            logger.info("Inserting RDBMS data into TerminusDB...")
-            self._insert_data(postcodes, provider_zones, routes)
+                routes: List[ProviderZoneRoute] = []
+                self._insert_data_stream(self._iter_routes(cursor), self._route_doc, sink=routes)
+                logger.info(f"Loaded {len(routes)} routes from RDBMS")
 
-            zones_by_provider = {}
-            for z in provider_zones:
-                if z.providerId not in zones_by_provider:
-                    zones_by_provider[z.providerId] = []
-                zones_by_provider[z.providerId].append(z)
+            # Build graph index
+            graph_index_dict = self._build_graph_index(postcodes, provider_zones, routes)
 
             return graph_index_dict, GraphIndex(
                 postcodes=postcodes,
-                providerZones=zones_by_provider,
-                zoneRoutes=aggregated_routes
+                providerZones=graph_index_dict['zones_by_provider'],
+                zoneRoutes=graph_index_dict['zone_routes_map']
             )
 
         finally:
             cursor.close()
             conn.close()
+
+    def _iter_rows(self, cursor) -> Iterator[Tuple]:
+        """Yield rows from the last executed query, batch_size rows at a time."""
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def _iter_postcodes(self, cursor) -> Iterator[Postcode]:
+        """Stream postcodes from fpzones"""
+        cursor.execute("SELECT PostalCode, Suburb, State FROM fpzones")
+        for row in self._iter_rows(cursor):
+            yield Postcode(code=row[0], suburb=row[1], state=row[2])
+
+    def _iter_zones(self, cursor) -> Iterator[ProviderZone]:
+        """Stream provider zones (with aggregated postcodes) from fp_pricing_rules"""
+        # Postcodes come back as a JSON array (SQL Server 2017+) so each row is
+        # parsed in one C call instead of a Python-level str.split
+        cursor.execute("""
+            SELECT provider_id, zone_name, service_type, 
+                   '[' + STRING_AGG(CAST('"' + STRING_ESCAPE(postal_code, 'json') + '"' AS NVARCHAR(MAX)), ',') + ']' as postcodes
+            FROM fp_pricing_rules
+            GROUP BY provider_id, zone_name, service_type
+        """)
+        for row in self._iter_rows(cursor):
+            yield ProviderZone(
+                providerId=row[0],
+                zoneCode=row[1],
+                category=row[2],
+                state="NSW",
+                postcodes=_json_loads(row[3])
+            )
+
+    def _iter_routes(self, cursor) -> Iterator[ProviderZoneRoute]:
+        """Stream zone-to-zone routes with pricing/timing"""
+        cursor.execute("""
+            SELECT 
+                p.provider_id, p.from_zone, p.to_zone,
+                c.base_cost, c.cost_per_kg,
+                e.etd_hours,
+                v.max_weight_kg
+            FROM fp_pricing_rules p
+            JOIN fpcosts c ON p.route_id = c.route_id
+            JOIN fpserviceetds e ON p.route_id = e.route_id
+            JOIN fpvehicles v ON p.provider_id = v.provider_id
+        """)
+        for row in self._iter_rows(cursor):
+            yield ProviderZoneRoute(
+                providerId=row[0],
+                fromZone=row[1],
+                toZone=row[2],
+                serviceType="",  # Set appropriately if available from your data
+                baseCharge=float(row[3]),
+                perKGRate=float(row[4]),
+                minCharge=float(row[3]),  # Or set to a different value if needed
+                deliveryHrs=float(row[5]),
+                maxMass=float(row[6])
+            )
     
     def export_graph_json(self, filepath: str = "graph_data.json") -> str:
         """
@@ -571,9 +802,10 @@ class TerminusDBLoader:
         Returns:
             Path to exported file
         """
-        try:
-            self.client.connect(db=self.dbName)
+        import requests  # installed with terminusdb-client
+        from terminusdb_client import WOQLQuery
 
+        try:
             logger.info(f"Exporting graph to {filepath}...")
 
             # Query all documents
@@ -585,11 +817,18 @@ class TerminusDBLoader:
             else:
                 safe_woql = {}
 
-            result = self.client.query(safe_woql)
+            try:
+                result = self._get_client().query(safe_woql)
+            except requests.ConnectionError:
+                result = self._get_client(reconnect=True).query(safe_woql)
 
             # Save to file
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=2)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(result, f, indent=2)
 
             logger.info(f"Graph exported successfully to {filepath}")
             return filepath
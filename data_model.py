@@ -13,12 +13,16 @@ Maps to RDBMS schema:
 - fpfreightproviders: Provider metadata
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timezone
+import sys
 import uuid
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Postcode:
     """Global postcode node (universal across all providers)"""
     code: str
@@ -34,7 +38,7 @@ class Postcode:
             return False
         return self.code == other.code
 
-@dataclass
+@dataclass(slots=True)
 class ProviderZone:
     """Provider-specific zone node"""
     providerId: str
@@ -51,7 +55,7 @@ class ProviderZone:
             return False
         return (self.providerId, self.zoneCode) == (other.providerId, other.zoneCode)
 
-@dataclass
+@dataclass(slots=True)
 class ProviderZoneRoute:
     """Zone-to-zone edge within a single provider (from fp_pricing_rules)"""
     providerId: str
@@ -76,7 +80,7 @@ class ProviderZoneRoute:
         charge += charge * (self.fuelLevyPct / 100)
         return charge
 
-@dataclass
+@dataclass(slots=True)
 class Shipment:
     """Booking/shipment with pickup and delivery details"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -93,7 +97,7 @@ class Shipment:
     serviceType: str = "Standard"
     createdAt: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
-@dataclass
+@dataclass(slots=True)
 class PathNode:
     """Node in search tree (for bidirectional A*)"""
     nodeType: str  # 'pc' for Postcode, 'pz' for ProviderZone
@@ -117,7 +121,7 @@ class PathNode:
         """Total estimated cost (A* Priority)"""
         return self.gCost + self.hCost
 
-@dataclass
+@dataclass(slots=True)
 class MultiHopPath:
     """Complete path result with multiple providers and segments"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -127,17 +131,13 @@ class MultiHopPath:
 
     totalCost: float = 0.0
     totalETD: float = 0.0  # in hours
-    providersInvolved: List[str] = field(default_factory=list)
-    numHops: int = 0
+    providersInvolved: List[str] = field(default_factory=list)  # distinct provider ids (callers dedupe)
+    numHops: int = 0  # number of segments
     reliabilityScore: float = 1.0
     totScore: float = 0.0
 
     rank: int = 0  # 1=best cost, 2=best time, 3=best overall (TOPSIS)
 
-    def __post_init__(self):
-        """Deduplicate providers"""
-        self.providersInvolved = list(set(self.providersInvolved))
-    
     def asDict(self) -> Dict:
         """Serialize path to dictionary"""
         return {
@@ -162,76 +162,312 @@ class SearchState:
     backwardVisited: dict[PathNode, float] = field(default_factory=dict)
     meetingPoints: List[Tuple[PathNode, PathNode]] = field(default_factory=list) 
 
+class StringInterner:
+    """Bidirectional mapping between strings and dense integer ids ("FP_1" -> 0)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        """Return the id for value, assigning the next free id if unseen"""
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._ids[value] = idx
+            self._strings.append(value)
+        return idx
+
+    def get(self, value: str, default: int = -1) -> int:
+        """Return the id for value without assigning one"""
+        return self._ids.get(value, default)
+
+    def lookup(self, idx: int) -> str:
+        """Return the string for an id"""
+        return self._strings[idx]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+@dataclass
+class RouteTable:
+    """
+    Structure-of-arrays view of ProviderZoneRoute edges.
+
+    Row i describes the same route as GraphIndex.routes[i]. Provider and zone
+    codes are ids from a StringInterner; numeric fields are contiguous float32
+    arrays so scans and filters can be vectorized with NumPy masks.
+    """
+    providerId: np.ndarray  # int32
+    fromZone: np.ndarray  # int32
+    toZone: np.ndarray  # int32
+    baseCharge: np.ndarray  # float32
+    perKGRate: np.ndarray  # float32
+    minCharge: np.ndarray  # float32
+    deliveryHrs: np.ndarray  # float32
+    maxMass: np.ndarray  # float32
+    reliabilityScore: np.ndarray  # float32
+    fuelLevyPct: np.ndarray  # float32
+
+    @classmethod
+    def fromRoutes(cls, routes: List[ProviderZoneRoute], interner: StringInterner) -> "RouteTable":
+        """Single pass over routes into preallocated arrays"""
+        n = len(routes)
+        ids = np.empty((3, n), dtype=np.int32)
+        nums = np.empty((7, n), dtype=np.float32)
+        for i, r in enumerate(routes):
+            ids[:, i] = (interner.intern(r.providerId), interner.intern(r.fromZone), interner.intern(r.toZone))
+            nums[:, i] = (r.baseCharge, r.perKGRate, r.minCharge, r.deliveryHrs, r.maxMass, r.reliabilityScore, r.fuelLevyPct)
+        return cls(*ids, *nums)
+
+    def __len__(self) -> int:
+        return len(self.providerId)
+
+    def costs(self, weightKG) -> np.ndarray:
+        """
+        Vectorized ProviderZoneRoute.calculateCost over every route, in
+        float32; an array of weights gives one row of route costs per weight
+        """
+        w = np.asarray(weightKG, dtype=np.float32)[..., None]
+        charge = np.maximum(self.baseCharge + w * self.perKGRate, self.minCharge)
+        return np.where(w <= 0, self.minCharge, charge + charge * (self.fuelLevyPct / 100))
+
+@dataclass
+class CSRAdjacency:
+    """
+    Compressed sparse row edge list over CompiledGraph node ids.
+
+    Edges leaving node v are offsets[v]:offsets[v+1]; every per-edge array is
+    aligned with targets. route[e] indexes GraphIndex.routes (and rows of
+    routeTable), or is -1 for the zero-cost postcode <-> zone entry/exit edges
+    (whose minCharge and deliveryHrs are 0).
+    """
+    offsets: np.ndarray  # int32[n+1]
+    targets: np.ndarray  # int32[m]
+    minCharge: np.ndarray  # float32[m]
+    deliveryHrs: np.ndarray  # float32[m]
+    route: np.ndarray  # int32[m]
+    routeTable: RouteTable
+
+    @classmethod
+    def fromEdges(cls, edges: List[List[Tuple[int, int]]], routeTable: RouteTable) -> "CSRAdjacency":
+        """edges[v] is an ordered list of (target_id, route_idx or -1)"""
+        offsets = np.zeros(len(edges) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum([len(out) for out in edges])
+        m = int(offsets[-1])
+        targets = np.empty(m, dtype=np.int32)
+        route = np.empty(m, dtype=np.int32)
+        e = 0
+        for out in edges:
+            for target, r in out:
+                targets[e] = target
+                route[e] = r
+                e += 1
+        transit = route >= 0
+        nums = np.zeros((2, m), dtype=np.float32)
+        nums[0, transit] = routeTable.minCharge[route[transit]]
+        nums[1, transit] = routeTable.deliveryHrs[route[transit]]
+        return cls(offsets, targets, *nums, route, routeTable)
+
+    def costs(self, weightKG) -> np.ndarray:
+        """
+        RouteTable.costs gathered onto the edges, aligned with targets
+        (entry/exit edges cost 0.0); an array of weights gives one row per weight
+        """
+        transit = self.route >= 0
+        edge_costs = np.zeros(np.shape(weightKG) + self.route.shape, dtype=np.float32)
+        edge_costs[..., transit] = self.routeTable.costs(weightKG)[..., self.route[transit]]
+        return edge_costs
+
+class CompiledGraph:
+    """
+    Dense integer view of the postcode/zone search graph for compiled kernels.
+
+    Every ('pc', code, None) and ('pz', zoneCode, providerId) node tuple used by
+    the engines gets an id; postcodes come first, so id < numPostcodes means a
+    postcode node. fwd holds the edges in the order the engines expand them
+    (postcode -> zones, zone -> outgoing routes then member postcodes) and rev
+    the same for a backward search (zone -> incoming routes then postcodes).
+    deadEnd[v] marks postcodes in at most one zone: stepping out of that zone
+    to them can only lead back into it, so searches skip such exits unless
+    the postcode is the search goal.
+    """
+
+    def __init__(self, index: "GraphIndex"):
+        self.nodes: List[Tuple[str, str, Optional[str]]] = []
+        self.nodeIndex: Dict[Tuple[str, str, Optional[str]], int] = {}
+
+        def add(node):
+            if node not in self.nodeIndex:
+                self.nodeIndex[node] = len(self.nodes)
+                self.nodes.append(node)
+
+        for code in index.postcodes:
+            add(('pc', code, None))
+        for zones in index.providerZones.values():
+            for zone in zones:
+                for pc in zone.postcodes:
+                    add(('pc', pc, None))
+        self.numPostcodes = len(self.nodes)
+
+        for providerId, zones in index.providerZones.items():
+            for zone in zones:
+                add(('pz', zone.zoneCode, providerId))
+        for route in index.routes:
+            add(('pz', route.fromZone, route.providerId))
+            add(('pz', route.toZone, route.providerId))
+
+        routes = index.routes
+        nodeIndex = self.nodeIndex
+        fwd = [[] for _ in self.nodes]
+        rev = [[] for _ in self.nodes]
+        # First member postcode of each zone (the one the heuristic looks at); -1 if empty
+        self.firstPostcode = np.arange(len(self.nodes), dtype=np.int32)
+
+        for v, (node_type, code, providerId) in enumerate(self.nodes):
+            if node_type == 'pc':
+                entries = [(nodeIndex[('pz', z, p)], -1) for p, z in index.get_ZonesForPostcode(code)]
+                fwd[v] = entries
+                rev[v] = list(entries)
+                continue
+
+            exits = [(nodeIndex[('pc', pc, None)], -1) for pc in index.get_PostcodesForZone(providerId, code)]
+            fwd[v] = [(nodeIndex[('pz', routes[r].toZone, providerId)], r) for r in index.get_OutgoingRouteIds(providerId, code).tolist()] + exits
+            rev[v] = [(nodeIndex[('pz', routes[r].fromZone, providerId)], r) for r in index.get_IncomingRouteIds(providerId, code).tolist()] + exits
+            self.firstPostcode[v] = exits[0][0] if exits else -1
+
+        self.fwd = CSRAdjacency.fromEdges(fwd, index.routeTable)
+        self.rev = CSRAdjacency.fromEdges(rev, index.routeTable)
+        self.deadEnd = np.zeros(len(self.nodes), dtype=np.bool_)
+        self.deadEnd[:self.numPostcodes] = np.diff(self.fwd.offsets[:self.numPostcodes + 1]) <= 1
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
 class GraphIndex:
     """In-memory graph index for fast lookups"""
     
     def __init__(self, postcodes: List[Postcode], providerZones: Dict[str, List[ProviderZone]], zoneRoutes: Dict[str, List[ProviderZoneRoute]]):
+        providerZones = self._internCodes(postcodes, providerZones, zoneRoutes)
         self.postcodes = {pc.code: pc for pc in postcodes}
         self.providerZones = providerZones
         self.zoneRoutes = zoneRoutes
 
-        self._zoneAdj = self._buildZoneAdjacency()
-        self._revZoneAdj = self._buildReverseZoneAdjacency()
+        # Flat SoA route storage: routes[i] <-> routeTable row i
+        self.interner = StringInterner()
+        self.routes: List[ProviderZoneRoute] = [r for route_list in zoneRoutes.values() for r in route_list]
+        self.routeTable = RouteTable.fromRoutes(self.routes, self.interner)
+
+        # Dense (provider_id, zone_code) ids + CSR route adjacency over them
+        self.zoneIndex = self._buildZoneIndex()
+        self._zoneAdj, self._revZoneAdj = self._buildZoneAdjacency()
+        self._outRoutes = self._buildRouteTuples(self._zoneAdj)
+        self._inRoutes = self._buildRouteTuples(self._revZoneAdj)
         self._pcToZones = self._buildPCtoZoneMap()
         self._zoneToPCs = self._buildZoneToPCMap()
 
-    def _buildZoneAdjacency(self) -> Dict[Tuple[str, str], List[ProviderZoneRoute]]:
-        """O(routes) precomputation: (provider_id, from_zone) → [routes]"""
-        adj = {}
-        for route_list in self.zoneRoutes.values():
-            for route in route_list:
-                key = (route.providerId, route.fromZone)
-                if key not in adj:
-                    adj[key] = []
-                adj[key].append(route)
-        return adj
-
-    def _buildReverseZoneAdjacency(self) -> Dict[Tuple[str, str], List[ProviderZoneRoute]]:
-        """O(routes) precomputation: (provider_id, to_zone) → [incoming_routes]"""
-        adj = {}
-        for route_list in self.zoneRoutes.values():
+        # Dense integer node ids + CSR adjacency shared by the search engines
+        self.compiled = CompiledGraph(self)
+
+    @staticmethod
+    def _internCodes(postcodes: List[Postcode], providerZones: Dict[str, List[ProviderZone]], zoneRoutes: Dict[str, List[ProviderZoneRoute]]) -> Dict[str, List[ProviderZone]]:
+        """
+        sys.intern every postcode, provider and zone code in place so the
+        tuple-keyed indices below hash and compare them by identity.
+        Returns providerZones re-keyed by the interned provider ids.
+        """
+        for pc in postcodes:
+            pc.code = sys.intern(pc.code)
+        for zones in providerZones.values():
+            for zone in zones:
+                zone.providerId = sys.intern(zone.providerId)
+                zone.zoneCode = sys.intern(zone.zoneCode)
+                zone.postcodes[:] = [sys.intern(pc) for pc in zone.postcodes]
+        for route_list in zoneRoutes.values():
             for route in route_list:
-                key = (route.providerId, route.toZone)
-                if key not in adj:
-                    adj[key] = []
-                adj[key].append(route)
-        return adj
-
-    def _buildPCtoZoneMap(self) -> Dict[str, List[Tuple[str, str]]]:
-        """O(zones * postcodes) precomputation: postcode → [(provider_id, zone_code)]"""
-        pcToZones = {}
+                route.providerId = sys.intern(route.providerId)
+                route.fromZone = sys.intern(route.fromZone)
+                route.toZone = sys.intern(route.toZone)
+        return {sys.intern(providerId): zones for providerId, zones in providerZones.items()}
+
+    def _buildZoneIndex(self) -> Dict[Tuple[str, str], int]:
+        """O(zones + routes) precomputation: (provider_id, zone_code) → zone id"""
+        zoneIndex = {}
+        for providerId, zones in self.providerZones.items():
+            for zone in zones:
+                zoneIndex.setdefault((providerId, zone.zoneCode), len(zoneIndex))
+        for route in self.routes:
+            zoneIndex.setdefault((route.providerId, route.fromZone), len(zoneIndex))
+            zoneIndex.setdefault((route.providerId, route.toZone), len(zoneIndex))
+        return zoneIndex
+
+    def _buildZoneAdjacency(self) -> Tuple[CSRAdjacency, CSRAdjacency]:
+        """
+        O(routes) precomputation: CSR over zone ids of outgoing routes and of
+        incoming routes; targets are zone ids and route[e] indexes self.routes
+        """
+        out = [[] for _ in self.zoneIndex]
+        inc = [[] for _ in self.zoneIndex]
+        for r, route in enumerate(self.routes):
+            fromId = self.zoneIndex[(route.providerId, route.fromZone)]
+            toId = self.zoneIndex[(route.providerId, route.toZone)]
+            out[fromId].append((toId, r))
+            inc[toId].append((fromId, r))
+        return CSRAdjacency.fromEdges(out, self.routeTable), CSRAdjacency.fromEdges(inc, self.routeTable)
+
+    def _buildRouteTuples(self, adj: CSRAdjacency) -> Dict[Tuple[str, str], Tuple[ProviderZoneRoute, ...]]:
+        """O(routes) precomputation: (provider_id, zone_code) → routes on adj's zone edges"""
+        offsets, route = adj.offsets.tolist(), adj.route.tolist()
+        return {key: tuple(self.routes[r] for r in route[offsets[z]:offsets[z + 1]])
+                for key, z in self.zoneIndex.items() if offsets[z] < offsets[z + 1]}
+
+    def _buildPCtoZoneMap(self) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+        """O(zones * postcodes) precomputation: postcode → ((provider_id, zone_code), ...)"""
+        pcToZones = defaultdict(list)
         for providerId, zones in self.providerZones.items():
             for zone in zones:
                 for pc in zone.postcodes:
-                    if pc not in pcToZones:
-                        pcToZones[pc] = []
                     pcToZones[pc].append((providerId, zone.zoneCode))
-        return pcToZones
+        return {pc: tuple(zones) for pc, zones in pcToZones.items()}
 
-    def _buildZoneToPCMap(self) -> Dict[Tuple[str, str], List[str]]:
-        """O(zones * postcodes) precomputation: (provider_id, zone_code) → [postcodes]"""
+    def _buildZoneToPCMap(self) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+        """O(zones * postcodes) precomputation: (provider_id, zone_code) → (postcodes, ...)"""
         zoneToPCs = {}
         for providerId, zones in self.providerZones.items():
             for zone in zones:
                 key = (providerId, zone.zoneCode)
-                zoneToPCs[key] = zone.postcodes
+                zoneToPCs[key] = tuple(zone.postcodes)
         return zoneToPCs
     
-    def get_OutgoingRoutes(self, providerId: str, fromZone: str) -> List[ProviderZoneRoute]:
+    def get_OutgoingRouteIds(self, providerId: str, fromZone: str) -> np.ndarray:
+        """O(1): Indices into self.routes of the routes leaving a zone"""
+        z = self.zoneIndex.get((providerId, fromZone))
+        if z is None:
+            return self._zoneAdj.route[:0]
+        return self._zoneAdj.route[self._zoneAdj.offsets[z]:self._zoneAdj.offsets[z + 1]]
+
+    def get_IncomingRouteIds(self, providerId: str, toZone: str) -> np.ndarray:
+        """O(1): Indices into self.routes of the routes arriving at a zone"""
+        z = self.zoneIndex.get((providerId, toZone))
+        if z is None:
+            return self._revZoneAdj.route[:0]
+        return self._revZoneAdj.route[self._revZoneAdj.offsets[z]:self._revZoneAdj.offsets[z + 1]]
+
+    def get_OutgoingRoutes(self, providerId: str, fromZone: str) -> Tuple[ProviderZoneRoute, ...]:
         """O(1): Get zone-to-zone routes from a zone"""
-        return self._zoneAdj.get((providerId, fromZone), [])
+        return self._outRoutes.get((providerId, fromZone), ())
     
-    def get_IncomingRoutes(self, providerId: str, toZone: str) -> List[ProviderZoneRoute]:
+    def get_IncomingRoutes(self, providerId: str, toZone: str) -> Tuple[ProviderZoneRoute, ...]:
         """O(1): Get routes ARRIVING at a zone"""
-        return self._revZoneAdj.get((providerId, toZone), [])
+        return self._inRoutes.get((providerId, toZone), ())
 
-    def get_ZonesForPostcode(self, postcode: str) -> List[Tuple[str, str]]:
+    def get_ZonesForPostcode(self, postcode: str) -> Tuple[Tuple[str, str], ...]:
         """O(1): Get (provider_id, zone_code) for a postcode"""
-        return self._pcToZones.get(postcode, [])
+        return self._pcToZones.get(postcode, ())
 
-    def get_PostcodesForZone(self, providerId: str, zoneCode: str) -> List[str]:
+    def get_PostcodesForZone(self, providerId: str, zoneCode: str) -> Tuple[str, ...]:
         """O(1): Get postcodes in a zone"""
-        return self._zoneToPCs.get((providerId, zoneCode), [])
+        return self._zoneToPCs.get((providerId, zoneCode), ())
     
     def get_Providers(self) -> List[str]:
         """O(1): Get list of all providers in the graph"""
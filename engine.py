@@ -13,8 +13,78 @@ Algorithm:
 
 import heapq
 import math
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
+
+import numpy as np
+
 from data_model import Postcode, Shipment, MultiHopPath, GraphIndex
+from search_kernels import (EDGE_COST_CACHE_SIZE, MEET_TOLERANCE, NUMBA_AVAILABLE, PARALLEL_SEARCH_THRESHOLD,
+                            astar_csr, astar_csr_many)
+
+# Width (in $) of one open-set bucket in _astar_search
+OPEN_SET_BUCKET_WIDTH = 0.5
+# Shipments per astar_csr_many call (bounds its (shipments, 2, nodes) result arrays)
+COMPILED_BATCH_SIZE = 64
+
+# Engine shared with forked find_mltihop_paths workers (set in the parent before the fork)
+_WORKER_ENGINE = None
+
+def _search_worker(args: Tuple) -> List:
+    """Run one find_mltihop_path call on the engine inherited from the parent process"""
+    shipment, maxCost, maxETD, maxHops, topK = args
+    return _WORKER_ENGINE.find_mltihop_path(shipment, maxCost, maxETD, maxHops, topK)
+
+class BucketQueue:
+    """
+    Open set bucketed on quantized f-cost: bucket b holds (f_cost, h, node)
+    entries with f in [f_min + b*width, f_min + (b+1)*width). Each bucket is
+    itself a small heap, so pops come out in exactly the same order as a single
+    global heap while most pushes/pops touch only a handful of items.
+    Buckets are added on demand up to the largest f actually pushed.
+    """
+    __slots__ = ('buckets', 'cur', 'size', 'f_min', 'width')
+
+    def __init__(self, f_min: float, width: float = OPEN_SET_BUCKET_WIDTH):
+        self.buckets = [[]]
+        self.cur = 0
+        self.size = 0
+        self.f_min = f_min
+        self.width = width
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, item: Tuple) -> None:
+        # Inconsistent heuristics can produce f below the cursor (or f_min):
+        # clamp into range and move the cursor back so ordering stays exact
+        b = int((item[0] - self.f_min) / self.width)
+        if b < 0:
+            b = 0
+        buckets = self.buckets
+        if b >= len(buckets):
+            buckets.extend([] for _ in range(b - len(buckets) + 1))
+        if b < self.cur:
+            self.cur = b
+        heapq.heappush(buckets[b], item)
+        self.size += 1
+
+    def peek(self) -> Tuple:
+        """Smallest entry (queue must be non-empty)"""
+        buckets = self.buckets
+        while not buckets[self.cur]:
+            self.cur += 1
+        return buckets[self.cur][0]
+
+    def pop(self) -> Tuple:
+        buckets = self.buckets
+        while not buckets[self.cur]:
+            self.cur += 1
+        self.size -= 1
+        return heapq.heappop(buckets[self.cur])
 
 class BidirectionalAStarEngine:
     """Multi-provider zone graph pathfinding with bidirectional A*"""
@@ -34,6 +104,32 @@ class BidirectionalAStarEngine:
             'ACT': (149.2, -35.3),  # Canberra
             'NT': (130.8, -12.5),   # Darwin
         }
+        # State-to-state heuristic table (scaled euclidean distance between state
+        # coords); the extra trailing column/row is 0.0 for postcodes with no
+        # usable state (index -1)
+        coords = list(self.state_coords.values())
+        self._state_idx = {state: i for i, state in enumerate(self.state_coords)}
+        self._state_dist = np.zeros((len(coords) + 1, len(coords) + 1), dtype=np.float32)
+        for i, (ax, ay) in enumerate(coords):
+            for j, (bx, by) in enumerate(coords):
+                self._state_dist[i, j] = math.sqrt((ax - bx)**2 + (ay - by)**2) * 0.01
+        # Plain-list copy + per-postcode rows for the pure-Python _heuristic
+        self._state_dist_rows = self._state_dist.tolist()
+        self._pc_state_idx = {pc: self._pc_state_index(pc) for pc in self.postcodes}
+
+        # Integer node ids + CSR adjacency; node_state[v] is the state index of
+        # the postcode the heuristic uses for node v
+        self.graph = graph_index.compiled
+        pc_state = np.array([self._pc_state_index(node[1]) for node in self.graph.nodes[:self.graph.numPostcodes]] + [-1], dtype=np.int64)
+        self._node_state = pc_state[self.graph.firstPostcode]
+
+        # The pure-Python search walks plain lists (numpy scalar access is slow there)
+        self._adjLists = {
+            forward: (adj.offsets.tolist(), adj.targets.tolist(), adj.deliveryHrs.tolist())
+            for forward, adj in ((True, self.graph.fwd), (False, self.graph.rev))
+        }
+        self._deadEnd = self.graph.deadEnd.tolist()
+        self._edgeCostCache: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
     
     def find_mltihop_path(self, shipment: Shipment, maxCost: float = float('inf'), maxETD: float = float('inf'), maxHops: int = 5, topK: int = 10) -> List[MultiHopPath]:
         """
@@ -42,316 +138,410 @@ class BidirectionalAStarEngine:
         Args:
             shipment: Shipment with origin/dest postcodes and weight
             max_cost: Cost threshold for pruning
-            max_etd: ETD threshold for pruning
+            max_etd: Limit on a path's total delivery hours
             max_hops: Maximum provider transitions
             top_k: Return top K paths
         
         Returns:
-            List of MultiHopPath sorted by cost (ascending)
+            Up to topK distinct MultiHopPaths sorted by cost (ascending), or
+            [] when no path fits maxCost/maxETD (the same contract as
+            engine_new.FreightAStarEngine.find_mltihop_path)
         """
 
-        if shipment.originPC not in self.postcodes:
-            raise ValueError(f"Origin postcode: {shipment.originPC} not found")
+        self._check_postcodes(shipment)
 
-        if shipment.destPC not in self.postcodes:
-            raise ValueError(f"Destination postcode: {shipment.destPC} not found")
-        
+        # Edge costs depend only on the shipment weight: price every CSR edge once
+        edge_costs = self._edge_costs(shipment.weightKG)
 
-        # Run bidirectional search
-        forward_paths = self._astar_search(shipment, shipment.originPC, shipment.destPC, True, maxCost, maxETD, maxHops)
-        backward_paths = self._astar_search(shipment, shipment.destPC, shipment.originPC, False, maxCost, maxETD, maxHops)
+        # Run bidirectional search (compiled kernel when numba is installed)
+        search = self._compiled_search if NUMBA_AVAILABLE else self._astar_search
+        forward_paths, backward_paths, mu = search(shipment, shipment.originPC, shipment.destPC, edge_costs, maxCost, maxETD, maxHops)
 
         #Merge and reconstruct paths
-        all_paths = self._merge_paths(shipment, forward_paths, backward_paths)
+        all_paths = self._merge_paths(shipment, forward_paths, backward_paths, mu, topK, maxETD, maxCost)
 
         # Rank and return top K paths
         all_paths.sort(key=lambda p: p.totalCost)
         return all_paths[:topK]
 
-    def _astar_search(self, shipment: Shipment, startPC: str, goalPC: str, forward: bool, maxCost: float, maxETD: float, maxHops: int) -> Dict:
+    def find_mltihop_paths(self, shipments: List[Shipment], maxCost: float = float('inf'), maxETD: float = float('inf'), maxHops: int = 5, topK: int = 10) -> List[List[MultiHopPath]]:
+        """
+        find_mltihop_path for a batch of shipments.
+
+        With numba, the batch's edge costs are priced in one broadcast and the
+        searches run as parallel astar_csr_many kernels. Otherwise each search
+        is pure-Python/GIL-bound, so large batches fan out to a process pool;
+        workers are forked so they share this engine's graph arrays
+        copy-on-write instead of pickling them, and where fork is unavailable
+        the batch runs in-process.
         """
-        Single-direction A* search
+        global _WORKER_ENGINE
+
+        for shipment in shipments:
+            self._check_postcodes(shipment)
+        if NUMBA_AVAILABLE:
+            return self._compiled_batch(shipments, maxCost, maxETD, topK)
+
+        workers = min(os.cpu_count() or 1, len(shipments))
+        if len(shipments) < PARALLEL_SEARCH_THRESHOLD or workers < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+            return [self.find_mltihop_path(s, maxCost, maxETD, maxHops, topK) for s in shipments]
+
+        _WORKER_ENGINE = self
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                args = [(s, maxCost, maxETD, maxHops, topK) for s in shipments]
+                return list(executor.map(_search_worker, args, chunksize=max(1, len(args) // (workers * 4))))
+        finally:
+            _WORKER_ENGINE = None
+
+    def _compiled_batch(self, shipments: List[Shipment], maxCost: float, maxETD: float, topK: int) -> List[List[MultiHopPath]]:
+        """Run astar_csr_many over shipments in blocks of COMPILED_BATCH_SIZE"""
+        graph, fwd, rev = self.graph, self.graph.fwd, self.graph.rev
+        results = []
+
+        for start in range(0, len(shipments), COMPILED_BATCH_SIZE):
+            block = shipments[start:start + COMPILED_BATCH_SIZE]
+            origins = np.array([graph.nodeIndex[('pc', s.originPC, None)] for s in block], dtype=np.int64)
+            dests = np.array([graph.nodeIndex[('pc', s.destPC, None)] for s in block], dtype=np.int64)
+            weights = np.array([s.weightKG for s in block], dtype=np.float64)
+            # (k, n) heuristic rows: every node's state against each shipment's goal state
+            dest_states = np.array([self._pc_state_index(s.destPC) for s in block], dtype=np.int64)
+            origin_states = np.array([self._pc_state_index(s.originPC) for s in block], dtype=np.int64)
+            heur_fwd = self._state_dist[dest_states[:, None], self._node_state[None, :]]
+            heur_bwd = self._state_dist[origin_states[:, None], self._node_state[None, :]]
+
+            g, parent, parent_edge, edge_cost, mu = astar_csr_many(
+                origins, dests, graph.numPostcodes, float(maxCost), float(maxETD), graph.deadEnd, heur_fwd, heur_bwd,
+                fwd.offsets, fwd.targets, fwd.costs(weights), fwd.deliveryHrs,
+                rev.offsets, rev.targets, rev.costs(weights), rev.deliveryHrs)
+
+            for i, shipment in enumerate(block):
+                paths = self._merge_paths(shipment, (g[i, 0], parent[i, 0], parent_edge[i, 0], edge_cost[i, 0]),
+                                          (g[i, 1], parent[i, 1], parent_edge[i, 1], edge_cost[i, 1]), float(mu[i]), topK, maxETD, maxCost)
+                paths.sort(key=lambda p: p.totalCost)
+                results.append(paths[:topK])
+
+        return results
+
+    def _check_postcodes(self, shipment: Shipment) -> None:
+        """Raise ValueError if the shipment's origin or destination postcode is unknown"""
+        if shipment.originPC not in self.postcodes:
+            raise ValueError(f"Origin postcode: {shipment.originPC} not found")
+
+        if shipment.destPC not in self.postcodes:
+            raise ValueError(f"Destination postcode: {shipment.destPC} not found")
+
+    def _edge_costs(self, weightKG: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Forward and reverse CSR edge costs at weightKG, memoized per weight"""
+        costs = self._edgeCostCache.get(weightKG)
+        if costs is None:
+            costs = (self.graph.fwd.costs(weightKG), self.graph.rev.costs(weightKG))
+            if len(self._edgeCostCache) >= EDGE_COST_CACHE_SIZE:
+                del self._edgeCostCache[next(iter(self._edgeCostCache))]
+            self._edgeCostCache[weightKG] = costs
+        return costs
+
+    def _astar_search(self, shipment: Shipment, originPC: str, destPC: str, edge_costs: Tuple[np.ndarray, np.ndarray], maxCost: float, maxETD: float, maxHops: int) -> Tuple[Tuple, Tuple, float]:
+        """
+        Bidirectional A* over CompiledGraph node ids
+
+        Alternates expansions between a forward search from originPC and a
+        backward search from destPC. mu tracks the cheapest origin -> dest cost
+        through a postcode reached by both sides; the search stops as soon as
+        either frontier's smallest f-cost reaches mu, since with an admissible
+        heuristic no cheaper meet can be found after that. edge_costs holds the
+        forward and reverse CSR edge costs at the shipment's weight. Each node
+        carries the delivery hours of the path that set its g; nodes over
+        maxETD are not relaxed and a meet only counts if both sides' hours
+        fit within maxETD (one label per node, so under a finite maxETD the
+        result is feasible but not always the cheapest feasible path).
         
         Returns:
-            Dictionary: node → (parent_node, cost, etd, hops, route_details)
+            (forward, backward, mu) where each side is (g_score, came_from,
+            edge_in, edge_cost) indexed by node id, the same layout astar_csr
+            produces: path cost, parent id (-1 if none), id of the CSR edge used
+            to reach the node and that edge's cost
         """
         
-        # Priority queue: (f_cost, counter, node)
-        counter = 0
-        open_set = []
-
-        start_node = ('pc', startPC, None)
-        start_cost = 0.0
-        start_h = self._heuristic(startPC, goalPC)
-
-        heapq.heappush(open_set, (start_h, counter, start_node))
-        counter += 1
-
-        # State tracking
-        g_score = {start_node: start_cost} # actual cost
-        f_score = {start_node: start_h}    # estimated total cost
-        came_from = {}   # for path reconstruction
-        edge_data = {}   #  store edge details (route, etc.)
-
-        visited = set()
-
-        while open_set:
-            current_f, _, current = heapq.heappop(open_set)
-
-            if current in visited:
+        n_nodes = len(self.graph)
+        num_pc = self.graph.numPostcodes
+        starts = (self.graph.nodeIndex[('pc', originPC, None)], self.graph.nodeIndex[('pc', destPC, None)])
+        costs = (edge_costs[0].tolist(), edge_costs[1].tolist())
+        adj = (self._adjLists[True], self._adjLists[False])
+        dead_end = self._deadEnd
+        # Heuristic of every node towards each side's goal, computed once per search
+        heur = (self._node_heuristics(destPC).tolist(), self._node_heuristics(originPC).tolist())
+
+        # State tracking per side (0 = forward, 1 = backward), dense by node id
+        g_score = (array('d', [float('inf')]) * n_nodes, array('d', [float('inf')]) * n_nodes)  # actual cost
+        came_from = (array('l', [-1]) * n_nodes, array('l', [-1]) * n_nodes)  # for path reconstruction
+        edge_in = (array('l', [-1]) * n_nodes, array('l', [-1]) * n_nodes)    # CSR edge used to reach node
+        edge_cost = (array('d', [0.0]) * n_nodes, array('d', [0.0]) * n_nodes)
+        etd_score = (array('d', [0.0]) * n_nodes, array('d', [0.0]) * n_nodes)  # delivery hours so far
+        visited = (bytearray(n_nodes), bytearray(n_nodes))
+        # Entries are (f, h, node): equal-f ties go to the deeper (lower-h) node
+        open_sets = []
+
+        for s in (0, 1):
+            start_h = heur[s][starts[s]]
+            g_score[s][starts[s]] = 0.0
+            open_sets.append(BucketQueue(start_h))
+            open_sets[s].push((start_h, start_h, starts[s]))
+
+        mu = 0.0 if starts[0] == starts[1] else float('inf')
+        side = 0
+
+        while open_sets[0] and open_sets[1]:
+            # Stop once either frontier can no longer beat the best meet
+            if max(open_sets[0].peek()[0], open_sets[1].peek()[0]) >= mu:
+                break
+
+            s = side
+            side ^= 1
+            g, other_g, h = g_score[s], g_score[1 - s], heur[s]
+            etd, other_etd = etd_score[s], etd_score[1 - s]
+            offsets, targets, edge_hrs = adj[s]
+            side_costs = costs[s]
+
+            current_f, _, current = open_sets[s].pop()
+
+            if visited[s][current]:
                 continue
-            visited.add(current)
+            visited[s][current] = 1
 
-            current_g = g_score[current]
-            node_type, node_id, provider_id = current
+            current_g = g[current]
             
             # Pruning: cost/etd thresholds
             if current_g > maxCost:
                 continue
                 
-            # Get neighbors based on node type
-            neighbors = self._get_neighbors(current, shipment, maxHops, forward)
-
-            for neighbor, edge_cost, edge_etd, route_info in neighbors:
-                neighbor_g = current_g + edge_cost
-                neighbor_h = self._heuristic_node(neighbor, goalPC)
-                neighbor_f = neighbor_g + neighbor_h
+            # Walk the CSR edges in place: postcodes lead to the zones that
+            # contain them (entry); zones lead along their outgoing routes
+            # (incoming when searching backward) and out to their member
+            # postcodes (exit). Entry/exit edges cost 0.0. Exits to postcodes
+            # in no other zone only loop back, so they're skipped unless goal.
+            goal = starts[1 - s]
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                if dead_end[neighbor] and neighbor != goal:
+                    continue
+                cost = side_costs[edge]
+                neighbor_g = current_g + cost
+                neighbor_f = neighbor_g + h[neighbor]
 
-                # Skip if this path is suboptimal
-                if neighbor in g_score and neighbor_g >= g_score[neighbor]:
+                # Skip if this path is suboptimal (unreached nodes hold inf)
+                if neighbor_g >= g[neighbor]:
                     continue
                 
                 # Skip if exceeds thresholds
-                if neighbor_g > maxCost or edge_etd > maxETD:
+                neighbor_etd = etd[current] + edge_hrs[edge]
+                if neighbor_g > maxCost or neighbor_etd > maxETD:
                     continue
                 
-                came_from[neighbor] = current
-                g_score[neighbor] = neighbor_g
-                f_score[neighbor] = neighbor_f
-                edge_data[neighbor] = {
-                    'cost': edge_cost,
-                    'etd': edge_etd,
-                    'route': route_info
-                }
-
-                heapq.heappush(open_set, (neighbor_f, counter, neighbor))
-                counter += 1
-        
-        return {
-            'parent': came_from,
-            'cost': g_score,
-            'edge': edge_data
-        }
-
-    def _get_neighbors(self, node: Tuple, shipment: Shipment, maxHops: int, forward: bool = True) -> List[Tuple[Tuple, float, float, Dict]]:
-        """
-        Get neighboring nodes from current node
+                came_from[s][neighbor] = current
+                g[neighbor] = neighbor_g
+                edge_in[s][neighbor] = edge
+                edge_cost[s][neighbor] = cost
+                etd[neighbor] = neighbor_etd
+
+                # Postcode reached from both sides: candidate meeting point
+                joined = neighbor_g + other_g[neighbor]
+                if neighbor < num_pc and joined < mu and joined <= maxCost and neighbor_etd + other_etd[neighbor] <= maxETD:
+                    mu = joined
+
+                # An entry with f >= mu would only be popped after the stop
+                # rule fires; its g is kept above for the meet scan
+                if neighbor_f < mu:
+                    open_sets[s].push((neighbor_f, h[neighbor], neighbor))
         
-        Returns:
-            List of (neighbor_node, edge_cost, edge_etd, route_info)
-        """
-
-        node_type, node_id, provider_id = node
-        neighbors = []
+        sides = tuple((g_score[s], came_from[s], edge_in[s], edge_cost[s]) for s in (0, 1))
+        return sides[0], sides[1], mu
+
+    def _compiled_search(self, shipment: Shipment, originPC: str, destPC: str, edge_costs: Tuple[np.ndarray, np.ndarray], maxCost: float, maxETD: float, maxHops: int) -> Tuple[Tuple, Tuple, float]:
+        """Run astar_csr; returns the same (forward, backward, mu) as _astar_search"""
+        graph, fwd, rev = self.graph, self.graph.fwd, self.graph.rev
+        origin = graph.nodeIndex[('pc', originPC, None)]
+        dest = graph.nodeIndex[('pc', destPC, None)]
+        heur_fwd = self._node_heuristics(destPC)
+        heur_bwd = self._node_heuristics(originPC)
+
+        g, parent, parent_edge, edge_cost, mu, _ = astar_csr(
+            origin, dest, graph.numPostcodes, float(maxCost), float(maxETD), graph.deadEnd, heur_fwd, heur_bwd,
+            fwd.offsets, fwd.targets, edge_costs[0], fwd.deliveryHrs,
+            rev.offsets, rev.targets, edge_costs[1], rev.deliveryHrs)
+        return (g[0], parent[0], parent_edge[0], edge_cost[0]), (g[1], parent[1], parent_edge[1], edge_cost[1]), float(mu)
+
+    def _pc_state_index(self, pc: str) -> int:
+        """Row of _state_dist for a postcode, or -1 if _heuristic would return 0"""
+        pc_obj = self.postcodes.get(pc)
+        if not pc_obj:
+            return -1
+        return self._state_idx.get(pc_obj.state or 'NSW', -1)
 
-        if node_type == 'pc':
-            # Postcode → ProviderZone (enter provider network)
-            for p_id, zone_code in self.index.get_ZonesForPostcode(node_id):
-                neighbor = ('pz', zone_code, p_id)
-                # Zero cost to enter zone
-                neighbors.append((neighbor, 0.0, 0.0, {'type': 'entry' if forward else 'exit'}))
-        
-        elif node_type == 'pz':
-            if forward:
-                # Forward: Zone -> Outgoing Routes -> Next Zone
-                routes = self.index.get_OutgoingRoutes(provider_id, node_id)
-                for route in routes:
-                    neighbor = ('pz', route.toZone, provider_id)
-                    edge_cost = route.calculateCost(shipment.weightKG)
-                    neighbors.append((neighbor, edge_cost, route.deliveryHrs, {
-                        'type': 'zone_route',
-                        'service': route.serviceType,
-                        'route': route
-                    }))
-            else:
-                # Backward: Zone -> Incoming Routes -> Previous Zone
-                routes = self.index.get_IncomingRoutes(provider_id, node_id)
-                for route in routes:
-                    neighbor = ('pz', route.fromZone, provider_id)
-                    edge_cost = route.calculateCost(shipment.weightKG)
-                    neighbors.append((neighbor, edge_cost, route.deliveryHrs, {
-                        'type': 'zone_route',
-                        'service': route.serviceType,
-                        'route': route
-                    }))
-            
-            # Zone → Postcode (exit to transfer point)
-            pcs = self.index.get_PostcodesForZone(provider_id, node_id)
-            for pc in pcs:
-                neighbor = ('pc', pc, None)
-                # Zero cost to exit (transfer cost handled separately if needed)
-                neighbors.append((neighbor, 0.0, 0.0, {'type': 'exit' if forward else 'entry'}))
-        
-        return neighbors
-    
     def _heuristic(self, pcA: str, pcB: str) -> float:
         """
         Admissible heuristic: geographic distance between postcodes
-        Simplified: use state-level distance
+        Simplified: use state-level distance, looked up in _state_dist
         """
-
-        pcA_obj = self.postcodes.get(pcA)
-        pcB_obj = self.postcodes.get(pcB)
-
-        if not pcA_obj or not pcB_obj:
-            return 0.0
-        
-        stateA = pcA_obj.state or 'NSW'
-        stateB = pcB_obj.state or 'NSW'
-
-        if stateA not in self.state_coords or stateB not in self.state_coords:
-            return 0.0
-        
-        lonA, latA = self.state_coords[stateA]
-        lonB, latB = self.state_coords[stateB]
-
-        # Euclidean distance scaled by typical $/km (very rough estimate)
-        distance = math.sqrt((lonA - lonB)**2 + (latA - latB)**2)
-        return distance * 0.01
+        return self._state_dist_rows[self._pc_state_idx.get(pcA, -1)][self._pc_state_idx.get(pcB, -1)]
     
-    def _heuristic_node(self, node: Tuple, goalPC: str) -> float:
-        """Heuristic from any node to goal"""
-        node_type, node_id, provider_id = node
-
-        if node_type == 'pc':
-            return self._heuristic(node_id, goalPC)
+    def _node_heuristics(self, goalPC: str) -> np.ndarray:
+        """
+        Heuristic from every node id to goalPC; a zone is scored by its first
+        member postcode and a zone with no postcodes by 0.0
+        """
+        return self._state_dist[self._node_state, self._pc_state_index(goalPC)]
+
+    def _edge_segment(self, curr: int, prev: int, cost: float, etd: float, r: int, forward: bool) -> Dict:
+        """Segment dict for the search edge prev -> curr (r is its route index or -1)"""
+        seg = {
+            'fromZone': self.graph.nodes[prev][1],
+            'toZone': self.graph.nodes[curr][1],
+            'cost': cost,
+            'etd': etd,
+        }
+        if r >= 0:
+            route = self.index.routes[r]
+            seg['type'] = 'zone_route'
+            seg['service'] = route.serviceType
+            seg['providerId'] = route.providerId
         else:
-            pcs = self.index.get_PostcodesForZone(provider_id, node_id)
-            if pcs:
-                return self._heuristic(pcs[0], goalPC)
-        return 0.0
-
-    def _reconstruct_path(self, goal: Tuple, came_from: Dict, g_score: Dict, edge_data: Dict, final_cost: float) -> Dict:
-        """Reconstruct path from start to goal"""
-
-        path = {}
-        current = goal
-
-        while current in came_from:
-            parent = came_from[current]
-            path[current] = {
-                'parent': parent,
-                'cost': g_score[current],
-                'edge': edge_data.get(current, {})
-            }
-            current = parent
-        
-        path[current] = {'parent': None, 'cost': 0.0, 'edge': {}}
-        return path
-    
-    def _unroll_path(self, end_node: Tuple, came_from: Dict, edge_data: Dict) -> Tuple[List[Tuple], List[Dict], float, float]:
+            # entry/exit labels are relative to the search direction (entry = into a zone)
+            seg['type'] = 'entry' if (curr >= self.graph.numPostcodes) == forward else 'exit'
+            seg['service'] = ''
+        return seg
+
+    def _unroll_path(self, meet: int, fwd: List[List], bwd: List[List]) -> Tuple[List[Tuple], List[Dict], float, float]:
+        """
+        Builds the origin -> dest path through node id meet by following the
+        forward parent pointers back to the origin and the backward ones on to
+        the destination. fwd/bwd are (parent, parent_edge, edge_cost, edge_hrs,
+        edge_route) lists for each search side.
+
+        Both chains are measured first so nodes and segments are allocated
+        once and filled in place, in path order.
+        Returns (nodes_list, segments_list, total_cost, total_etd) with nodes as
+        (nodeType, nodeId, providerId) tuples
         """
-        Backtracks from end_node to start using came_from pointers.
+        nodes_by_id = self.graph.nodes
+
+        hops = []
+        for parent in (fwd[0], bwd[0]):
+            n, curr = 0, parent[meet]
+            while curr >= 0:
+                n += 1
+                curr = parent[curr]
+            hops.append(n)
+        f_hops, b_hops = hops
+
+        nodes = [None] * (f_hops + b_hops + 1)
+        segments = [None] * (f_hops + b_hops)
+        nodes[f_hops] = nodes_by_id[meet]
+        totals = []
+
+        # Forward chain fills meet -> origin from index f_hops down, the
+        # backward chain meet -> dest from f_hops up
+        for step, (parent, parent_edge, edge_cost, edge_hrs, edge_route) in ((-1, fwd), (1, bwd)):
+            forward = step < 0
+            totalCost = 0.0
+            totalETD = 0.0
+            i = f_hops
+            curr = meet
+            prev = parent[curr]
+            while prev >= 0:
+                e = parent_edge[curr]
+                cost = edge_cost[curr]
+                etd = edge_hrs[e]
+                totalCost += cost
+                totalETD += etd
+
+                segments[i - 1 if forward else i] = self._edge_segment(curr, prev, cost, etd, edge_route[e], forward)
+                i += step
+                nodes[i] = nodes_by_id[prev]
+                curr = prev
+                prev = parent[curr]
+            totals.append((totalCost, totalETD))
+
+        (f_cost, f_etd), (b_cost, b_etd) = totals
+        return nodes, segments, f_cost + b_cost, f_etd + b_etd
+
+    @staticmethod
+    def _drop_loops(nodes: List[Tuple], segments: List[Dict]) -> Tuple[List[Tuple], List[Dict], float, float]:
+        """
+        Cuts the loop out of a stitched path that visits a node on both search
+        sides (a postcode meet reached through a zone the other side also used),
+        keeping the shorter path between the two visits.
         Returns (nodes_list, segments_list, total_cost, total_etd)
         """
-
-        nodes = []
-        segments = []
-        totalCost = 0.0
-        totalETD = 0.0
-
-        curr = end_node
-        while curr is not None:
-            nodes.append(curr)
-
-            if curr in edge_data:
-                data = edge_data[curr]
-                totalCost += data['cost']
-                totalETD += data['etd']
-
-                route_info = data['route']
-                seg = {
-                    'fromZone': came_from[curr][1] if came_from[curr] else 'START',
-                    'toZone': curr[1],
-                    'cost': data['cost'],
-                    'etd': data['etd'],
-                    'type': route_info.get('type', ''),
-                    'service': route_info.get('service', '')
-                }
-
-                if 'route' in route_info and hasattr(route_info['route'], 'providerId'):
-                    seg['providerId'] = route_info['route'].providerId
-            
-                segments.append(seg)
-            
-            curr = came_from.get(curr)
-
-        return nodes, segments, totalCost, totalETD
-    
-    def _merge_paths(self, shipment: Shipment, forward: Dict, backward: Dict) -> List[MultiHopPath]:
+        first = {}
+        i = 0
+        while i < len(nodes):
+            j = first.setdefault(nodes[i], i)
+            if j < i:
+                # segments[k] joins nodes[k] -> nodes[k + 1]
+                nodes = nodes[:j] + nodes[i:]
+                segments = segments[:j] + segments[i:]
+                first = {node: k for k, node in enumerate(nodes[:j + 1])}
+                i = j
+            i += 1
+        return nodes, segments, sum(seg['cost'] for seg in segments), sum(seg['etd'] for seg in segments)
+
+    def _merge_paths(self, shipment: Shipment, forward: Tuple, backward: Tuple, mu: float, topK: int,
+                     maxETD: float = float('inf'), maxCost: float = float('inf')) -> List[MultiHopPath]:
         """
         Merge forward and backward search results
-        Find common postcodes where paths can meet
+        Find common postcodes where paths can meet, keeping those whose
+        combined cost is within MEET_TOLERANCE of the best meet mu and within
+        maxCost, cheapest first, until topK paths are built. Meets on an
+        already returned path would rebuild that same path and are skipped,
+        as are stitched paths that exceed maxETD. Loops through a node seen on
+        both search sides are cut out first, so paths never revisit a node
         """
         paths = []
-
-        fwd_visited = forward['cost']
-        bwd_visited = backward['cost']
-
-        common_nodes = set(fwd_visited.keys()) & set(bwd_visited.keys())
-
-        for meet_node in common_nodes:
-            if meet_node[0] != 'pc':
+        num_pc = self.graph.numPostcodes
+        combined = np.asarray(forward[0][:num_pc]) + np.asarray(backward[0][:num_pc])
+        common = np.flatnonzero(np.isfinite(combined) & (combined <= mu * (1 + MEET_TOLERANCE)) & (combined <= maxCost))
+        common = common[np.argsort(combined[common], kind='stable')]
+
+        # Plain lists index far faster than numpy scalars in the Python unroll loop
+        fwd = [a.tolist() for a in forward[1:]] + [self.graph.fwd.deliveryHrs.tolist(), self.graph.fwd.route.tolist()]
+        bwd = [a.tolist() for a in backward[1:]] + [self.graph.rev.deliveryHrs.tolist(), self.graph.rev.route.tolist()]
+
+        covered, seen = set(), set()
+        for meet in common.tolist():
+            if len(paths) >= topK:
+                break
+            if meet in covered:
                 continue
+            nodes, full_segs, total_cost, total_etd = self._unroll_path(meet, fwd, bwd)
+            if len(set(nodes)) < len(nodes):
+                nodes, full_segs, total_cost, total_etd = self._drop_loops(nodes, full_segs)
+            if total_etd > maxETD or tuple(nodes) in seen:
+                continue
+            seen.add(tuple(nodes))
+            covered.update(self.graph.nodeIndex[node] for node in nodes)
 
-            # 1. Trace Start -> Meet
-            f_nodes, f_segs, f_cost, f_etd = self._unroll_path(meet_node, forward['parent'], forward['edge'])
-            f_nodes.reverse()
-            f_segs.reverse()
-
-            # 2. Trace Meet -> End
-            b_nodes, b_segs, b_cost, b_etd = self._unroll_path(meet_node, backward['parent'], backward['edge'])
-
-            # 3. Combine
-            full_nodes = f_nodes + b_nodes[1:]
-            full_segs = f_segs + b_segs
-            total_cost = f_cost + b_cost
-            total_etd = f_etd + b_etd
-            
-            # Extract Providers
-            providers = set()
-            for seg in full_segs:
-                if 'providerId' in seg:
-                    providers.add(seg['providerId'])
-            
-            path = MultiHopPath(
+            providers = {seg['providerId'] for seg in full_segs if 'providerId' in seg}
+            paths.append(MultiHopPath(
                 shipmentId=shipment.id,
                 totalCost=total_cost,
                 totalETD=total_etd,
-                nodes=full_nodes,
+                nodes=nodes,
                 segments=full_segs,
                 providersInvolved=list(providers),
-                numHops=len(providers)
-            )
-            paths.append(path)
-
-        if not paths:
-            return [self.create_default_path(shipment)]
+                numHops=len(full_segs)
+            ))
 
         return paths
     
-    def create_default_path(self, shipment: Shipment) -> MultiHopPath:
-        """Fallback single-hop path if bidirectional search fails"""
-        return MultiHopPath(shipmentId=shipment.id, totalCost=float('inf'), totalETD=float('inf'), nodes=[('pc', shipment.originPC, None), ('pc', shipment.destPC, None)], numHops=0)
-    
 class RouteOptimizer:
     """High-level API for route optimization"""
 
     def __init__(self, engine: BidirectionalAStarEngine):
         self.engine = engine
 
-    def unoptimized(self, shipment: Shipment) -> MultiHopPath:
-        return self.engine.create_default_path(shipment)
+    def unoptimized(self, shipment: Shipment) -> List[MultiHopPath]:
+        return []
 
     def optimized_for_cost(self, shipment: Shipment, maxETD: float = float('inf')) -> List[MultiHopPath]:
         """Get cheapest route(s)"""
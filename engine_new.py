@@ -1,16 +1,104 @@
 """
-Forward A* Engine for Multi-Provider Zone Graph
-================================================
-Finds optimal multi-provider paths using standard unidirectional A* search.
+Bidirectional A* Engine for Multi-Provider Zone Graph
+=====================================================
+Finds optimal multi-provider paths by searching forward from the origin and
+backward from the destination until the two frontiers meet.
 """
 
 import heapq
+import logging
 import math
-from typing import Dict, List, Tuple
+import multiprocessing
+import os
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Container, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from data_model import Postcode, Shipment, MultiHopPath, GraphIndex
+from search_kernels import EDGE_COST_CACHE_SIZE, MEET_TOLERANCE, NUMBA_AVAILABLE, PARALLEL_SEARCH_THRESHOLD, astar_csr, njit
+
+# Edge type codes yielded by the neighbor generators and kept per node for
+# path reconstruction; TRANSIT edges carry an index into GraphIndex.routes
+ENTRY_EDGE, TRANSIT_EDGE, EXIT_EDGE = 0, 1, 2
+
+logger = logging.getLogger(__name__)
+
+# ALT heuristic: at most this many landmark postcodes (one per state)
+MAX_LANDMARKS = 16
+
+# CompiledGraph -> (dist_from, dist_to) landmark tables, shared by every
+# engine built on the same graph (Streamlit builds one per rerun)
+_LANDMARK_TABLES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Engine of a RouteOptimizer.parallel_batch worker, set once per process by _init_worker
+_ENGINE = None
+
+def _init_worker(engine: "FreightAStarEngine") -> None:
+    """Pool initializer: keep the engine for every task this worker runs"""
+    global _ENGINE
+    _ENGINE = engine
+
+def _path_worker(args: Tuple) -> List[MultiHopPath]:
+    """Run one find_mltihop_path call on the worker's engine"""
+    shipment, maxCost, maxETD = args
+    return _ENGINE.find_mltihop_path(shipment, maxCost, maxETD)
+
+@njit(cache=True)
+def _dijkstra_csr(origin, goals, max_cost, max_etd, dead_end, offsets, targets, cost, hrs):
+    """
+    Compiled single-source Dijkstra over CompiledGraph ids (same pop order and
+    relaxations as FreightAStarEngine._shared_search), stopping once every
+    node in goals is settled or the frontier exceeds max_cost. dead_end nodes
+    (CompiledGraph.deadEnd) are only relaxed if they are goals, and labels
+    whose accumulated hrs exceed max_etd are dropped.
+
+    Returns (g, parent, parent_edge) indexed by node id; unreached nodes have
+    g = inf and parent = -1.
+    """
+    n = len(offsets) - 1
+    g = np.full(n, np.inf)
+    parent = np.full(n, -1, dtype=np.int32)
+    parent_edge = np.full(n, -1, dtype=np.int32)
+    etd = np.zeros(n)
+    settled = np.zeros(n, dtype=np.bool_)
+    is_goal = np.zeros(n, dtype=np.bool_)
+    for t in goals:
+        is_goal[t] = True
+    remaining = is_goal.sum()
+
+    g[origin] = 0.0
+    open_set = [(0.0, np.int64(origin))]
+    while open_set and remaining > 0:
+        current_g, current = heapq.heappop(open_set)
+        if settled[current]:
+            continue
+        settled[current] = True
+        if is_goal[current]:
+            remaining -= 1
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = np.int64(targets[e])
+            if dead_end[neighbor] and not is_goal[neighbor]:
+                continue
+            tentative_g = current_g + cost[e]
+            if tentative_g > max_cost or tentative_g >= g[neighbor]:
+                continue
+            tentative_etd = etd[current] + hrs[e]
+            if tentative_etd > max_etd:
+                continue
+            g[neighbor] = tentative_g
+            etd[neighbor] = tentative_etd
+            parent[neighbor] = current
+            parent_edge[neighbor] = e
+            heapq.heappush(open_set, (tentative_g, neighbor))
+
+    return g, parent, parent_edge
 
 class FreightAStarEngine:
-    """Multi-provider zone graph pathfinding with Forward A*"""
+    """Multi-provider zone graph pathfinding with Bidirectional A*"""
 
     def __init__(self, graph_index: GraphIndex, postcodes_dict: Dict[str, Postcode]):
         self.index = graph_index
@@ -23,140 +111,457 @@ class FreightAStarEngine:
             'SA': (139.2, -34.4),  'TAS': (147.1, -42.9),
             'ACT': (149.2, -35.3), 'NT': (130.8, -12.5),
         }
+
+        # State-to-state heuristic table (scaled euclidean distance between state
+        # coords; unknown state -> coords (0,0) at row S), looked up by
+        # _heuristic and sliced into per-query node tables by _node_heuristics;
+        # the trailing row/col is 0.0 for missing postcodes and zones without
+        # postcodes (index -1)
+        coords = list(self.state_coords.values()) + [(0, 0)]
+        self._state_idx = {state: i for i, state in enumerate(self.state_coords)}
+        self._state_dist = np.zeros((len(coords) + 1, len(coords) + 1))
+        for i, (ax, ay) in enumerate(coords):
+            for j, (bx, by) in enumerate(coords):
+                self._state_dist[i, j] = math.sqrt((ax - bx)**2 + (ay - by)**2) * 0.01
+        # Plain-list copy + per-postcode rows for the scalar _heuristic
+        self._state_dist_rows = self._state_dist.tolist()
+        self._pc_state_idx = {pc: self._pc_state_index(pc) for pc in self.postcodes}
+        self.graph = graph_index.compiled
+        pc_state = np.array([self._pc_state_index(node[1]) for node in self.graph.nodes[:self.graph.numPostcodes]] + [-1], dtype=np.int64)
+        self._node_state = pc_state[self.graph.firstPostcode]
+        self._landmark_from, self._landmark_to = self._landmark_tables()
+        self._dead_end = self.graph.deadEnd.tolist()
+
+        # Pure-Python search works on the same node ids: per node, the
+        # (neighbor_id, edge_idx, route_idx or -1) edges of graph.fwd / graph.rev
+        self._adjacency = ([], [])
+        for s, adj in enumerate((self.graph.fwd, self.graph.rev)):
+            offsets = adj.offsets.tolist()
+            edges = list(zip(adj.targets.tolist(), range(len(adj.targets)), adj.route.tolist()))
+            self._adjacency[s].extend(edges[lo:hi] for lo, hi in zip(offsets[:-1], offsets[1:]))
+
+        # One bit per provider for the providers-on-path mask in _reconstruct_path
+        self._provider_bit: Dict[str, int] = {}
+        for providerId in list(graph_index.providerZones) + [route.providerId for route in graph_index.routes]:
+            self._provider_bit.setdefault(providerId, 1 << len(self._provider_bit))
+
+        # weightKG -> (fwd, rev) edge costs; insertion-ordered, oldest evicted first
+        self._edgeCostCache: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
     
     def find_mltihop_path(self, shipment: Shipment, maxCost: float = float('inf'), maxETD: float = float('inf'), maxHops: int = 5, topK: int = 10) -> List[MultiHopPath]:
+        """
+        Up to topK distinct paths, cheapest first, or [] when no path fits
+        maxCost/maxETD (the same contract as engine.BidirectionalAStarEngine)
+        """
         if shipment.originPC not in self.postcodes:
             raise ValueError(f"Origin postcode: {shipment.originPC} not found")
         if shipment.destPC not in self.postcodes:
             raise ValueError(f"Destination postcode: {shipment.destPC} not found")
 
-        # Priority queue: (f_score, tie_breaker, current_node)
-        # Node: (node_type, node_id, provider_id)
-        start_node = ('pc', shipment.originPC, None)
-        
-        counter = 0 
-        open_set = []
-        
-        h_start = self._heuristic(shipment.originPC, shipment.destPC)
-        heapq.heappush(open_set, (h_start, counter, start_node))
-        
-        came_from = {}
-        g_score = {start_node: 0.0}
-        edge_data = {}
+        search = self._compiled_search if NUMBA_AVAILABLE else self._astar_search
+        g_score, came_from, edge_data, mu, meet = search(shipment, maxCost, maxETD)
+        paths = self._collect_paths(shipment, g_score, came_from, edge_data, mu, meet, topK, maxETD, maxCost) if meet >= 0 else []
+        if not paths:
+            logger.info("No path found for shipment %s: %s -> %s", shipment.id, shipment.originPC, shipment.destPC)
+        return paths
+
+    def _astar_search(self, shipment: Shipment, maxCost: float, maxETD: float = float('inf')) -> Tuple[Tuple, Tuple, Tuple, float, int]:
+        """
+        Bidirectional A* over CompiledGraph node ids: side 0 searches forward
+        from the origin, side 1 backward from the destination, alternating
+        until either frontier's smallest f reaches mu, the best meeting cost.
+        Each node also carries etd_score, the delivery hours of the path that
+        set its g; labels over maxETD are dropped and a meet only counts if
+        both sides' hours together fit within maxETD.
+
+        With one label per node, a faster but dearer route into a node first
+        reached over a slow, cheap one is never explored, so under a finite
+        maxETD the search returns a feasible path but not always the cheapest
+        feasible one.
+
+        Returns (g_score, came_from, edge_data, mu, meet), each of the first
+        three a (forward, backward) pair indexed by node id; meet is the node
+        mu was found at (-1 if the frontiers never met).
+        """
+        graph = self.graph
+        n = len(graph)
+        start = (graph.nodeIndex[('pc', shipment.originPC, None)], graph.nodeIndex[('pc', shipment.destPC, None)])
+        # Each side's goal; the only dead-end postcode its exits may reach
+        targets = ((start[1],), (start[0],))
+        expand = (self._get_forward_neighbors, self._get_backward_neighbors)
+        heur = (self._node_heuristics(shipment.destPC).tolist(), self._node_heuristics(shipment.originPC, forward=False).tolist())
+        costs = tuple(c.tolist() for c in self._edge_costs(shipment.weightKG))
+
+        # Priority queues: (f_score, h, node_id); equal-f ties go to the deeper (lower-h) node
+        open_sets = tuple([(heur[s][start[s]], heur[s][start[s]], start[s])] for s in (0, 1))
+        # Per-node search state lives in typed contiguous buffers (8/4/1 bytes a
+        # node), which allocate per query far faster than lists of n objects
+        g_score = (array('d', [float('inf')]) * n, array('d', [float('inf')]) * n)
+        g_score[0][start[0]] = 0.0
+        g_score[1][start[1]] = 0.0
+        came_from = (array('i', [-1]) * n, array('i', [-1]) * n)
+        # Edge each node was reached by: (edge_type, edge_ref, cost) per side
+        edge_data = tuple((bytearray(n), array('i', [-1]) * n, array('d', [0.0]) * n) for _ in (0, 1))
+        etd_score = (array('d', [0.0]) * n, array('d', [0.0]) * n)
+        closed = (bytearray(n), bytearray(n))
+
+        # Best meeting cost and the node it was found at
+        mu = 0.0 if shipment.originPC == shipment.destPC else float('inf')
+        meet = start[0] if mu == 0.0 else -1
+
+        side = 0
+        while open_sets[0] and open_sets[1]:
+            # Stop once either frontier can no longer beat the best meet
+            if max(open_sets[0][0][0], open_sets[1][0][0]) >= mu:
+                break
+
+            s = side
+            side = 1 - side
+            _, _, current = heapq.heappop(open_sets[s])
+            if closed[s][current]:
+                continue
+            closed[s][current] = 1
+
+            current_g = g_score[s][current]
+            if current_g > maxCost:
+                continue
+
+            edge_type, edge_ref, edge_cost = edge_data[s]
+            current_etd = etd_score[s][current]
+            for neighbor, cost, etd, e_type, e_ref in expand[s](current, costs[s], targets[s]):
+                # Cheap rejections before the heuristic lookup
+                tentative_g = current_g + cost
+                if tentative_g > maxCost or tentative_g >= g_score[s][neighbor]:
+                    continue
+                tentative_etd = current_etd + etd
+                if tentative_etd > maxETD:
+                    continue
+
+                came_from[s][neighbor] = current
+                g_score[s][neighbor] = tentative_g
+                edge_type[neighbor] = e_type
+                edge_ref[neighbor] = e_ref
+                edge_cost[neighbor] = cost
+                etd_score[s][neighbor] = tentative_etd
+
+                # Meet-in-the-middle: the other side has already reached this
+                # node, and the joined path fits both budgets
+                joined = tentative_g + g_score[1 - s][neighbor]
+                if joined < mu and joined <= maxCost and tentative_etd + etd_score[1 - s][neighbor] <= maxETD:
+                    mu = joined
+                    meet = neighbor
+
+                h_val = heur[s][neighbor]
+                if tentative_g + h_val < mu:
+                    heapq.heappush(open_sets[s], (tentative_g + h_val, h_val, neighbor))
 
-        found_paths = []
+        return g_score, came_from, edge_data, mu, meet
 
-        while open_set:
-            current_f, _, current = heapq.heappop(open_set)
-            current_type, current_id, _ = current
+    def find_mltihop_paths(self, shipments: List[Shipment], maxCost: float = float('inf'), maxETD: float = float('inf')) -> List[List[MultiHopPath]]:
+        """
+        Cheapest path for each of several shipments.
 
-            # GOAL REACHED
-            if current_type == 'pc' and current_id == shipment.destPC:
-                final_path = self._reconstruct_path(current, came_from, edge_data, shipment)
-                found_paths.append(final_path)
-                break 
+        Shipments sharing an origin and weight (so the same edge costs) are
+        answered by one Dijkstra from that origin that runs until all of the
+        group's destinations are settled; each path is then read off the shared
+        shortest-path tree. Results are in the order of shipments; a shipment
+        with no path gets an empty list.
 
-            if g_score[current] > maxCost:
+        Unlike find_mltihop_path this returns at most one path per shipment
+        (there is no topK). maxETD is enforced the same way, on accumulated
+        delivery hours with one label per node, so a path is returned only if
+        it fits within maxETD.
+        """
+        for shipment in shipments:
+            if shipment.originPC not in self.postcodes:
+                raise ValueError(f"Origin postcode: {shipment.originPC} not found")
+            if shipment.destPC not in self.postcodes:
+                raise ValueError(f"Destination postcode: {shipment.destPC} not found")
+
+        graph = self.graph
+        groups: Dict[Tuple[str, float], List[int]] = {}
+        for i, shipment in enumerate(shipments):
+            groups.setdefault((shipment.originPC, shipment.weightKG), []).append(i)
+
+        results: List[List[MultiHopPath]] = [[] for _ in shipments]
+        no_parent = array('i', [-1]) * len(graph)
+        for (originPC, weightKG), members in groups.items():
+            origin = graph.nodeIndex[('pc', originPC, None)]
+            goals = [graph.nodeIndex[('pc', shipments[i].destPC, None)] for i in members]
+            g, came_from, edge_data = self._shared_search(origin, goals, weightKG, maxCost, maxETD)
+            for i, goal in zip(members, goals):
+                if g[goal] == float('inf'):
+                    logger.debug("No path found for shipment %s: %s -> %s", shipments[i].id, originPC, shipments[i].destPC)
+                else:
+                    results[i] = [self._reconstruct_path(goal, (came_from, no_parent), (edge_data, edge_data), shipments[i])]
+
+        return results
+
+    def _shared_search(self, origin: int, goals: List[int], weightKG: float, maxCost: float, maxETD: float = float('inf')) -> Tuple[Sequence[float], Sequence[int], Tuple[Sequence, Sequence, Sequence]]:
+        """
+        Forward Dijkstra from origin until every goal is settled (_dijkstra_csr
+        when numba is installed), dropping labels over maxETD.
+
+        Returns (g_score, came_from, edge_data) in the per-node layout of
+        find_mltihop_path's forward side.
+        """
+        fwd = self.graph.fwd
+        costs = self._edge_costs(weightKG)[0]
+
+        if NUMBA_AVAILABLE:
+            g, parent, parent_edge = _dijkstra_csr(origin, np.array(goals, dtype=np.int64), float(maxCost), float(maxETD), self.graph.deadEnd,
+                                                   fwd.offsets, fwd.targets, costs, fwd.deliveryHrs)
+            reached = parent_edge >= 0
+            route = np.where(reached, fwd.route[parent_edge], -1)
+            edge_type = self._edge_types(parent_edge, route)
+            edge_cost = np.where(reached, costs[parent_edge], 0.0)
+            return g.tolist(), parent.tolist(), (edge_type.tolist(), route.tolist(), edge_cost.tolist())
+
+        n = len(self.graph)
+        costs = costs.tolist()
+        g_score = array('d', [float('inf')]) * n
+        came_from = array('i', [-1]) * n
+        edge_type, edge_ref, edge_cost = bytearray(n), array('i', [-1]) * n, array('d', [0.0]) * n
+        etd_score = array('d', [0.0]) * n
+        settled = bytearray(n)
+        goal_set = set(goals)
+        remaining = set(goals)
+
+        g_score[origin] = 0.0
+        open_set = [(0.0, origin)]
+        while open_set and remaining:
+            current_g, current = heapq.heappop(open_set)
+            if settled[current]:
                 continue
+            settled[current] = 1
+            remaining.discard(current)
+
+            current_etd = etd_score[current]
+            for neighbor, cost, etd, e_type, e_ref in self._get_forward_neighbors(current, costs, goal_set):
+                tentative_g = current_g + cost
+                if tentative_g > maxCost or tentative_g >= g_score[neighbor]:
+                    continue
+                tentative_etd = current_etd + etd
+                if tentative_etd > maxETD:
+                    continue
+                g_score[neighbor] = tentative_g
+                etd_score[neighbor] = tentative_etd
+                came_from[neighbor] = current
+                edge_type[neighbor] = e_type
+                edge_ref[neighbor] = e_ref
+                edge_cost[neighbor] = cost
+                heapq.heappush(open_set, (tentative_g, neighbor))
+
+        return g_score, came_from, (edge_type, edge_ref, edge_cost)
+
+    def _compiled_search(self, shipment: Shipment, maxCost: float, maxETD: float = float('inf')) -> Tuple[Tuple, Tuple, Tuple, float, int]:
+        """Run astar_csr; returns the same (g_score, came_from, edge_data, mu, meet) as _astar_search"""
+        graph, fwd, rev = self.graph, self.graph.fwd, self.graph.rev
+        origin = graph.nodeIndex[('pc', shipment.originPC, None)]
+        dest = graph.nodeIndex[('pc', shipment.destPC, None)]
+        heur_fwd = self._node_heuristics(shipment.destPC)
+        heur_bwd = self._node_heuristics(shipment.originPC, forward=False)
+        fwd_cost, rev_cost = self._edge_costs(shipment.weightKG)
+
+        # Every node can be a meeting point (num_pc = n)
+        g, parent, parent_edge, edge_cost, mu, meet = astar_csr(
+            origin, dest, len(graph.nodes), float(maxCost), float(maxETD), graph.deadEnd, heur_fwd, heur_bwd,
+            fwd.offsets, fwd.targets, fwd_cost, fwd.deliveryHrs,
+            rev.offsets, rev.targets, rev_cost, rev.deliveryHrs)
+
+        edge_data = []
+        for s, adj in ((0, fwd), (1, rev)):
+            edge_ref = np.where(parent_edge[s] >= 0, adj.route[parent_edge[s]], -1)
+            edge_data.append((self._edge_types(parent_edge[s], edge_ref, forward=(s == 0)), edge_ref, edge_cost[s]))
+        return (g[0], g[1]), (parent[0], parent[1]), tuple(edge_data), float(mu), int(meet)
+
+    def _collect_paths(self, shipment: Shipment, g_score: Tuple, came_from: Tuple, edge_data: Tuple, mu: float, meet: int, topK: int,
+                       maxETD: float = float('inf'), maxCost: float = float('inf')) -> List[MultiHopPath]:
+        """
+        Up to topK distinct paths, cheapest first: the best meet, then other
+        nodes both sides reached whose combined cost is within MEET_TOLERANCE
+        of mu (and within maxCost). Meets on an already returned path would
+        rebuild that same path and are skipped, as are stitches that revisit a
+        node or whose total ETD exceeds maxETD.
+        """
+        combined = np.asarray(g_score[0]) + np.asarray(g_score[1])
+        candidates = np.flatnonzero((combined <= mu * (1 + MEET_TOLERANCE)) & (combined <= maxCost))
+        candidates = candidates[np.argsort(combined[candidates], kind='stable')]
+
+        paths = []
+        covered = set()
+        for v in [meet] + candidates.tolist():
+            if len(paths) >= topK:
+                break
+            if v in covered:
+                continue
+            path = self._reconstruct_path(v, came_from, edge_data, shipment)
+            if len(set(path.nodes)) < len(path.nodes) or path.totalETD > maxETD:
+                continue
+            covered.update(self.graph.nodeIndex[node] for node in path.nodes)
+            paths.append(path)
+
+        return paths
+
+    def _edge_types(self, parent_edge: np.ndarray, route: np.ndarray, forward: bool = True) -> np.ndarray:
+        """
+        Edge type of the edge each node was reached by, as the neighbor
+        generators label it: TRANSIT for routes, otherwise ENTRY or EXIT by the
+        kind of node reached (a zone is entered going forward, exited going
+        backward). Unreached nodes keep 0, like the Python searches' buffers.
+        """
+        reached_zone = np.arange(len(parent_edge)) >= self.graph.numPostcodes
+        into_zone, into_pc = (ENTRY_EDGE, EXIT_EDGE) if forward else (EXIT_EDGE, ENTRY_EDGE)
+        edge_type = np.where(route >= 0, TRANSIT_EDGE, np.where(reached_zone, into_zone, into_pc))
+        return np.where(parent_edge >= 0, edge_type, 0)
 
-            # EXPAND FORWARD ONLY
-            neighbors = self._get_forward_neighbors(current, shipment)
-
-            for neighbor, cost, etd, info in neighbors:
-                tentative_g = g_score[current] + cost
-                
-                if tentative_g > maxCost: continue
-                
-                if tentative_g < g_score.get(neighbor, float('inf')):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    
-                    h_val = self._heuristic_node(neighbor, shipment.destPC)
-                    f_score = tentative_g + h_val
-                    
-                    edge_data[neighbor] = {'cost': cost, 'etd': etd, 'info': info}
-                    
-                    counter += 1
-                    heapq.heappush(open_set, (f_score, counter, neighbor))
-
-        if not found_paths:
-            return [self.create_default_path(shipment)]
-            
-        return found_paths
-
-    def _get_forward_neighbors(self, node: Tuple, shipment: Shipment) -> List[Tuple]:
-        node_type, node_id, provider_id = node
-        neighbors = []
-
-        # 1. Postcode -> Enter Zone
-        if node_type == 'pc':
-            zones = self.index.get_ZonesForPostcode(node_id)
-            for p_id, zone_code in zones:
-                neighbor = ('pz', zone_code, p_id)
-                neighbors.append((neighbor, 0.0, 0.0, {'type': 'entry', 'provider': p_id}))
-
-        # 2. Zone -> Next Zone OR Exit
-        elif node_type == 'pz':
-            # Transit
-            routes = self.index.get_OutgoingRoutes(provider_id, node_id)
-            for route in routes:
-                neighbor = ('pz', route.toZone, provider_id)
-                cost = route.calculateCost(shipment.weightKG)
-                neighbors.append((neighbor, cost, route.deliveryHrs, {'type': 'transit', 'route': route}))
-            
-            # Exit
-            pcs_in_zone = self.index.get_PostcodesForZone(provider_id, node_id)
-            for pc in pcs_in_zone:
-                neighbor = ('pc', pc, None)
-                neighbors.append((neighbor, 0.0, 0.0, {'type': 'exit', 'provider': provider_id}))
-
-        return neighbors
+    def _edge_costs(self, weightKG: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Forward and reverse CSR edge costs at weightKG, memoized per weight"""
+        costs = self._edgeCostCache.get(weightKG)
+        if costs is None:
+            costs = (self.graph.fwd.costs(weightKG), self.graph.rev.costs(weightKG))
+            if len(self._edgeCostCache) >= EDGE_COST_CACHE_SIZE:
+                del self._edgeCostCache[next(iter(self._edgeCostCache))]
+            self._edgeCostCache[weightKG] = costs
+        return costs
+
+    def _get_forward_neighbors(self, node: int, costs: List[float], goals: Container[int]) -> Iterator[Tuple[int, float, float, int, int]]:
+        """
+        Yields (neighbor_id, cost, etd, edge_type, edge_ref); costs are the
+        forward _edge_costs at the shipment weight. Exits to dead-end postcodes
+        (in no other zone) are only yielded for postcodes in goals.
+        """
+        is_postcode = node < self.graph.numPostcodes
+        routes = self.index.routes
+        dead_end = self._dead_end
+
+        for neighbor, e, r in self._adjacency[0][node]:
+            # Zone -> Next Zone
+            if r >= 0:
+                yield neighbor, costs[e], routes[r].deliveryHrs, TRANSIT_EDGE, r
+            # Postcode -> Enter Zone
+            elif is_postcode:
+                yield neighbor, 0.0, 0.0, ENTRY_EDGE, -1
+            # Zone -> Exit (handoff postcodes, or the goal)
+            elif not dead_end[neighbor] or neighbor in goals:
+                yield neighbor, 0.0, 0.0, EXIT_EDGE, -1
+
+    def _get_backward_neighbors(self, node: int, costs: List[float], goals: Container[int]) -> Iterator[Tuple[int, float, float, int, int]]:
+        """
+        Predecessors of node, typed as the forward edge; costs are the reverse
+        _edge_costs, and dead-end postcodes are skipped unless in goals
+        """
+        is_postcode = node < self.graph.numPostcodes
+        routes = self.index.routes
+        dead_end = self._dead_end
+
+        for neighbor, e, r in self._adjacency[1][node]:
+            # Zone <- Previous Zone
+            if r >= 0:
+                yield neighbor, costs[e], routes[r].deliveryHrs, TRANSIT_EDGE, r
+            # Postcode <- Exit Zone
+            elif is_postcode:
+                yield neighbor, 0.0, 0.0, EXIT_EDGE, -1
+            # Zone <- Entry (handoff postcodes, or the goal)
+            elif not dead_end[neighbor] or neighbor in goals:
+                yield neighbor, 0.0, 0.0, ENTRY_EDGE, -1
 
     def _heuristic(self, pcA: str, pcB: str) -> float:
-        objA, objB = self.postcodes.get(pcA), self.postcodes.get(pcB)
-        if not objA or not objB: return 0.0
-        
-        coordA = self.state_coords.get(objA.state, (0,0))
-        coordB = self.state_coords.get(objB.state, (0,0))
-        dist = math.sqrt((coordA[0]-coordB[0])**2 + (coordA[1]-coordB[1])**2)
-        return dist * 0.01
+        """State-level distance between postcodes, looked up in _state_dist"""
+        return self._state_dist_rows[self._pc_state_idx.get(pcA, -1)][self._pc_state_idx.get(pcB, -1)]
 
-    def _heuristic_node(self, node: Tuple, goalPC: str) -> float:
-        if node[0] == 'pc': return self._heuristic(node[1], goalPC)
-        pcs = self.index.get_PostcodesForZone(node[2], node[1])
-        return self._heuristic(pcs[0], goalPC) if pcs else 0.0
+    def _pc_state_index(self, pc: str) -> int:
+        """Row of _state_dist for a postcode (-1 if missing, so the heuristic is 0)"""
+        obj = self.postcodes.get(pc)
+        if not obj: return -1
+        return self._state_idx.get(obj.state, len(self.state_coords))
 
-    def _reconstruct_path(self, current: Tuple, came_from: Dict, edge_data: Dict, shipment: Shipment) -> MultiHopPath:
+    def _landmark_tables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ALT landmark distances, computed once per CompiledGraph: dist_from[i, v]
+        is the cost from landmark i to node v and dist_to[i, v] from v to it
+        (inf if unreachable). Edges are priced at minCharge, the least a route
+        costs at any weight, so the bounds hold for every shipment.
+        """
+        tables = _LANDMARK_TABLES.get(self.graph)
+        if tables is None:
+            graph = self.graph
+            landmarks = {}
+            for v, node in enumerate(graph.nodes[:graph.numPostcodes]):
+                pc_obj = self.postcodes.get(node[1])
+                if pc_obj and len(landmarks) < MAX_LANDMARKS:
+                    landmarks.setdefault(pc_obj.state, v)
+
+            all_nodes = np.arange(len(graph), dtype=np.int64)
+            tables = tuple(
+                np.array([_dijkstra_csr(L, all_nodes, np.inf, np.inf, graph.deadEnd, adj.offsets, adj.targets, adj.minCharge, adj.deliveryHrs)[0]
+                          for L in landmarks.values()]).reshape(len(landmarks), len(graph))
+                for adj in (graph.fwd, graph.rev))
+            _LANDMARK_TABLES[graph] = tables
+        return tables
+
+    def _node_heuristics(self, goalPC: str, forward: bool = True) -> np.ndarray:
+        """
+        Heuristic for every node id: towards goalPC for the forward search, or
+        from it (the origin) for the backward one. The larger of the state
+        distance (_heuristic; zones use their first postcode) and the ALT
+        landmark bound max_L |d(L, .) differences|, which is admissible by the
+        triangle inequality. inf marks nodes that cannot reach / be reached.
+        """
+        state_h = self._state_dist[self._node_state, self._pc_state_index(goalPC)]
+        goal = self.graph.nodeIndex.get(('pc', goalPC, None))
+        if goal is None or not len(self._landmark_from):
+            return state_h
+
+        d_from, d_to = self._landmark_from, self._landmark_to
+        with np.errstate(invalid='ignore'):
+            if forward:
+                # d(v, t) >= d(L, t) - d(L, v) and d(v, L) - d(t, L)
+                bound = np.fmax(d_from[:, goal, None] - d_from, d_to - d_to[:, goal, None])
+            else:
+                # d(s, v) >= d(L, v) - d(L, s) and d(s, L) - d(v, L)
+                bound = np.fmax(d_from - d_from[:, goal, None], d_to[:, goal, None] - d_to)
+            # inf - inf (both unreachable) bounds nothing
+            bound = np.fmax.reduce(bound, axis=0)
+        return np.fmax(state_h, bound)
+
+    def _reconstruct_path(self, meet: int, came_from: Tuple[Sequence[int], Sequence[int]], edge_data: Tuple[Tuple[Sequence, Sequence, Sequence], ...], shipment: Shipment) -> MultiHopPath:
+        """Stitch the forward path origin -> meet to the backward path meet -> destination"""
         nodes = []
         segments = []
         total_cost = 0.0
         total_etd = 0.0
-        providers = set()
-
-        while current in came_from:
-            prev = came_from[current]
-            data = edge_data[current]
-            
-            total_cost += data['cost']
-            total_etd += data['etd']
-
-            if data['info']['type'] == 'transit':
-                route = data['info']['route']
-                providers.add(route.providerId)
-                segments.append({
-                    'providerId': route.providerId,
-                    'fromZone': route.fromZone,
-                    'toZone': route.toZone,
-                    'cost': data['cost'],
-                    'etd': data['etd']
-                })
-            
-            nodes.append(current)
-            current = prev
-        
-        nodes.append(current)
-        nodes.reverse()
-        segments.reverse()
+        provider_mask = 0
+
+        for s in (0, 1):
+            side_nodes = []
+            side_segments = []
+            edge_type, edge_ref, edge_cost = edge_data[s]
+            current = meet
+            while came_from[s][current] >= 0:
+                # entry/exit edges are free; only transit routes become segments
+                if edge_type[current] == TRANSIT_EDGE:
+                    route = self.index.routes[edge_ref[current]]
+                    cost = float(edge_cost[current])
+                    total_cost += cost
+                    total_etd += route.deliveryHrs
+                    provider_mask |= self._provider_bit[route.providerId]
+                    side_segments.append({
+                        'providerId': route.providerId,
+                        'fromZone': route.fromZone,
+                        'toZone': route.toZone,
+                        'cost': cost,
+                        'etd': route.deliveryHrs
+                    })
+
+                current = came_from[s][current]
+                side_nodes.append(self.graph.nodes[current])
+            if s == 0:
+                side_nodes.reverse()
+                side_segments.reverse()
+                side_nodes.append(self.graph.nodes[meet])
+            nodes.extend(side_nodes)
+            segments.extend(side_segments)
 
         return MultiHopPath(
             shipmentId=shipment.id,
@@ -164,25 +569,16 @@ class FreightAStarEngine:
             totalETD=total_etd,
             nodes=nodes,
             segments=segments,
-            providersInvolved=list(providers),
-            numHops=len(providers)
-        )
-
-    def create_default_path(self, shipment: Shipment) -> MultiHopPath:
-        return MultiHopPath(
-            shipmentId=shipment.id, 
-            totalCost=float('inf'), 
-            totalETD=float('inf'), 
-            nodes=[], 
-            numHops=0
+            providersInvolved=[p for p, bit in self._provider_bit.items() if provider_mask & bit],
+            numHops=len(segments)
         )
 
 class RouteOptimizer:
     def __init__(self, engine: FreightAStarEngine):
         self.engine = engine
 
-    def unoptimized(self, shipment: Shipment) -> MultiHopPath:
-        return self.engine.create_default_path(shipment)
+    def unoptimized(self, shipment: Shipment) -> List[MultiHopPath]:
+        return []
 
     def optimized_for_cost(self, shipment: Shipment, maxETD: float = float('inf')) -> List[MultiHopPath]:
         return self.engine.find_mltihop_path(shipment, maxETD=maxETD)
@@ -191,4 +587,42 @@ class RouteOptimizer:
         return self.engine.find_mltihop_path(shipment, maxCost=maxCost)
     
     def optimize_multi_criteria(self, shipment: Shipment) -> List[MultiHopPath]:
-        return self.engine.find_mltihop_path(shipment)
\ No newline at end of file
+        return self.engine.find_mltihop_path(shipment)
+
+    def batch_optimize(self, shipments: List[Shipment], maxCost: float = float('inf'), maxETD: float = float('inf')) -> List[List[MultiHopPath]]:
+        """Cheapest path (at most one) per shipment; see FreightAStarEngine.find_mltihop_paths"""
+        return self.engine.find_mltihop_paths(shipments, maxCost=maxCost, maxETD=maxETD)
+
+    def parallel_batch(self, shipments: List[Shipment], n_workers: Optional[int] = None, maxCost: float = float('inf'), maxETD: float = float('inf')) -> List[List[MultiHopPath]]:
+        """
+        find_mltihop_path for each shipment across a process pool, in the order
+        of shipments. Without numba, workers are forked where possible so they
+        share the engine's graph arrays copy-on-write. With numba, a parallel
+        kernel (e.g. engine.astar_csr_many) may already have started threads
+        in this process, and forking then can leave the interpreter unable to
+        exit; workers are started with 'forkserver' (or 'spawn') instead and
+        the engine is pickled once per worker through the pool initializer,
+        so callers running a script must guard it with
+        if __name__ == '__main__'.
+
+        n_workers defaults to os.cpu_count() and is capped at len(shipments).
+        With n_workers=1 (or a one-CPU machine), or fewer than
+        PARALLEL_SEARCH_THRESHOLD shipments, no pool is started and the batch
+        runs in-process.
+        """
+        if n_workers is not None and n_workers < 1:
+            raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+        workers = min(n_workers or os.cpu_count() or 1, len(shipments))
+        # A single worker process would only add fork and pickling overhead
+        if len(shipments) < PARALLEL_SEARCH_THRESHOLD or workers < 2:
+            return [self.engine.find_mltihop_path(s, maxCost, maxETD) for s in shipments]
+
+        methods = multiprocessing.get_all_start_methods()
+        if not NUMBA_AVAILABLE and 'fork' in methods:
+            method = 'fork'
+        else:
+            method = 'forkserver' if 'forkserver' in methods else 'spawn'
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                 initializer=_init_worker, initargs=(self.engine,)) as executor:
+            args = [(s, maxCost, maxETD) for s in shipments]
+            return list(executor.map(_path_worker, args, chunksize=max(1, len(args) // (workers * 4))))
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Compiled Search Kernels
+=======================
+Numba kernels and tuning constants shared by the BidirectionalAStarEngine
+(engine.py) and FreightAStarEngine (engine_new.py) searches. Without numba
+the kernels still import as plain Python functions.
+"""
+
+import heapq
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels below still import without numba"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# Meeting postcodes within this fraction of the best combined cost are kept as alternatives
+MEET_TOLERANCE = 0.2
+# Per-weight edge cost arrays kept by each engine (oldest weight evicted first)
+EDGE_COST_CACHE_SIZE = 32
+# Below this many shipments, find_mltihop_paths searches in-process (forking costs more)
+PARALLEL_SEARCH_THRESHOLD = 64
+
+@njit(cache=True)
+def astar_csr(origin, dest, num_pc, max_cost, max_etd, dead_end, heur_fwd, heur_bwd,
+              fwd_offsets, fwd_targets, fwd_cost, fwd_hrs,
+              rev_offsets, rev_targets, rev_cost, rev_hrs):
+    """
+    Compiled bidirectional A* over CompiledGraph ids (same alternation,
+    pruning and stopping rule as BidirectionalAStarEngine._astar_search).
+    fwd_cost/rev_cost are the per-edge costs at the shipment's weight;
+    dead_end is CompiledGraph.deadEnd (never relaxed unless the goal). Each
+    node also carries the delivery hours of the path that set its g: labels
+    over max_etd are dropped, and a meet only counts if the joined path's
+    cost and hours fit within max_cost and max_etd. Edge and heuristic inputs are float32; g accumulates in
+    float64, as in the pure-Python search, so both return the same paths.
+
+    One label is kept per node, so a faster but dearer route into a node
+    that was first reached over a slow, cheap one is not explored: with a
+    finite max_etd the result is a feasible path, not always the cheapest.
+
+    Returns (g, parent, parent_edge, edge_cost, mu, meet): the arrays are
+    shaped (2, n) with row 0 the forward and row 1 the backward search;
+    unreached nodes have g = inf and parent = -1. meet is the node mu was
+    last lowered at (-1 if the frontiers never met).
+    """
+    n = len(fwd_offsets) - 1
+    g = np.full((2, n), np.inf)
+    parent = np.full((2, n), -1, dtype=np.int32)
+    parent_edge = np.full((2, n), -1, dtype=np.int32)
+    edge_cost = np.zeros((2, n))
+    etd = np.zeros((2, n))
+    visited = np.zeros((2, n), dtype=np.bool_)
+
+    g[0, origin] = 0.0
+    g[1, dest] = 0.0
+    # Entries are (f, h, node): equal-f ties go to the deeper (lower-h) node
+    open_fwd = [(np.float64(heur_fwd[origin]), np.float64(heur_fwd[origin]), np.int64(origin))]
+    open_bwd = [(np.float64(heur_bwd[dest]), np.float64(heur_bwd[dest]), np.int64(dest))]
+    mu = 0.0 if origin == dest else np.inf
+    meet = origin if origin == dest else -1
+
+    side = 0
+    while open_fwd and open_bwd:
+        # Stop once either frontier can no longer beat the best meet
+        if max(open_fwd[0][0], open_bwd[0][0]) >= mu:
+            break
+
+        s = side
+        side = 1 - side
+        if s == 0:
+            open_set, heur, goal = open_fwd, heur_fwd, dest
+            offsets, targets, costs, hrs = fwd_offsets, fwd_targets, fwd_cost, fwd_hrs
+        else:
+            open_set, heur, goal = open_bwd, heur_bwd, origin
+            offsets, targets, costs, hrs = rev_offsets, rev_targets, rev_cost, rev_hrs
+
+        _, _, current = heapq.heappop(open_set)
+        if visited[s, current]:
+            continue
+        visited[s, current] = True
+
+        current_g = g[s, current]
+        if current_g > max_cost:
+            continue
+
+        for e in range(offsets[current], offsets[current + 1]):
+            cost = costs[e]
+            neighbor = np.int64(targets[e])
+            if dead_end[neighbor] and neighbor != goal:
+                continue
+            neighbor_g = current_g + cost
+            if neighbor_g > max_cost or neighbor_g >= g[s, neighbor]:
+                continue
+            neighbor_etd = etd[s, current] + hrs[e]
+            if neighbor_etd > max_etd:
+                continue
+
+            parent[s, neighbor] = current
+            parent_edge[s, neighbor] = e
+            edge_cost[s, neighbor] = cost
+            g[s, neighbor] = neighbor_g
+            etd[s, neighbor] = neighbor_etd
+            joined = neighbor_g + g[1 - s, neighbor]
+            if (neighbor < num_pc and joined < mu and joined <= max_cost
+                    and neighbor_etd + etd[1 - s, neighbor] <= max_etd):
+                mu = joined
+                meet = neighbor
+            if neighbor_g + heur[neighbor] < mu:
+                heapq.heappush(open_set, (neighbor_g + heur[neighbor], np.float64(heur[neighbor]), neighbor))
+
+    return g, parent, parent_edge, edge_cost, mu, meet
+
+@njit(parallel=True, cache=True)
+def astar_csr_many(origins, dests, num_pc, max_cost, max_etd, dead_end, heur_fwd, heur_bwd,
+                   fwd_offsets, fwd_targets, fwd_cost, fwd_hrs,
+                   rev_offsets, rev_targets, rev_cost, rev_hrs):
+    """
+    astar_csr for a batch of shipments, one search per prange iteration.
+    heur_*/fwd_cost/rev_cost hold one row per shipment; results gain a
+    leading shipment axis: g etc. are (k, 2, n) and mu is (k,).
+    """
+    k = len(origins)
+    n = len(fwd_offsets) - 1
+    g = np.empty((k, 2, n))
+    parent = np.empty((k, 2, n), dtype=np.int32)
+    parent_edge = np.empty((k, 2, n), dtype=np.int32)
+    edge_cost = np.empty((k, 2, n))
+    mu = np.empty(k)
+
+    for i in prange(k):
+        g[i], parent[i], parent_edge[i], edge_cost[i], mu[i], _ = astar_csr(
+            origins[i], dests[i], num_pc, max_cost, max_etd, dead_end, heur_fwd[i], heur_bwd[i],
+            fwd_offsets, fwd_targets, fwd_cost[i], fwd_hrs,
+            rev_offsets, rev_targets, rev_cost[i], rev_hrs)
+
+    return g, parent, parent_edge, edge_cost, mu
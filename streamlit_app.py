@@ -11,6 +11,8 @@ Features:
 """
 
 import streamlit as st
+import pandas as pd
+from dataclasses import asdict
 from datetime import datetime
 import json
 from data_loader import TerminusDBLoader
@@ -161,19 +163,40 @@ with tabs[0]:
 # TAB 2: ROUTE FINDER
 # ============================================================================
 
+@st.cache_data
+def sorted_postcodes(_graph_index, data_source):
+    """Postcode choices for the selectboxes, sorted once per data source"""
+    return sorted(_graph_index.postcodes.keys())
+
+@st.cache_data(max_entries=512)
+def find_routes(_optimizer, _shipment, data_source, origin_pc, dest_pc, weight_kg, max_cost, max_etd, criteria):
+    """
+    Run the selected optimizer call, memoized across reruns. The key is every
+    input the search depends on (volume doesn't affect it); _optimizer and
+    _shipment are excluded from hashing, data_source stands in for the graph.
+    """
+    if criteria == "None":
+        return _optimizer.unoptimized(_shipment)
+    elif criteria == "Lowest Cost":
+        return _optimizer.optimized_for_cost(_shipment, maxETD=max_etd)
+    elif criteria == "Fastest":
+        return _optimizer.optimized_for_time(_shipment, maxCost=max_cost)
+    return _optimizer.optimize_multi_criteria(_shipment)
+
 with tabs[1]:
     st.header("🔍 Find Best Route(s)")
+    postcode_options = sorted_postcodes(graph_index, data_source)
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Shipment Details")
-        origin_pc = st.selectbox("Origin Postcode", sorted(graph_index.postcodes.keys()), key="origin")
+        origin_pc = st.selectbox("Origin Postcode", postcode_options, key="origin")
         weight_kg = st.number_input("Weight (kg)", value = 100, min_value=1, step=10)
     
     with col2:
         st.subheader("")
-        dest_pc = st.selectbox("Destination Postcode", sorted(graph_index.postcodes.keys()), key="dest")
+        dest_pc = st.selectbox("Destination Postcode", postcode_options, key="dest")
         volume_cbm = st.number_input("Volume (CBM)", value=0.5, min_value=0.0, step=0.1)
 
     # Optimization criteria
@@ -202,25 +225,16 @@ with tabs[1]:
         
         try:
             with st.spinner("🔍 Searching for optimal routes..."):
-                if criteria == "None":
-                    paths = optimizer.unoptimized(shipment)
-                elif criteria == "Lowest Cost":
-                    paths = optimizer.optimized_for_cost(shipment, maxETD=max_etd)
-                elif criteria == "Fastest":
-                    paths = optimizer.optimized_for_time(shipment, maxCost=max_cost)
-                else:
-                    paths = optimizer.optimize_multi_criteria(shipment)
+                paths = find_routes(optimizer, shipment, data_source, origin_pc, dest_pc, weight_kg, max_cost, max_etd, criteria)
 
             st.markdown("---")
-            if isinstance(paths, list):
-                num_paths = len(paths)
-            elif paths is not None:
-                paths = [paths]
-                num_paths = 1
-            else:
-                paths = []
-                num_paths = 0
+            num_paths = len(paths)
+            # Cache hits are copies of an earlier query's paths
+            for path in paths:
+                path.shipmentId = shipment.id
             st.subheader(f"Top Routes (0-{num_paths})")
+            if not paths and criteria != "None":
+                st.info("No route found within the search limits")
 
             for i, path in enumerate(paths, 1):
                 with st.expander(f"**Route {i}** | Cost: ${path.totalCost:.2f} | ETD: {path.totalETD:.1f} hrs | Providers: {', '.join(path.providersInvolved)}"):
@@ -244,7 +258,7 @@ with tabs[1]:
                     
                     # Export Route
                     if st.button(f"📥 Export Route {i}", key=f"export_{i}"):
-                        st.json(vars(path))
+                        st.json(asdict(path))
         except Exception as e:
             st.error(f"❌ Route search failed: {e}")
             st.exception(e)
@@ -252,8 +266,50 @@ with tabs[1]:
 # TAB 3: ANALYTICS
 # ============================================================================
 
+@st.cache_data
+def network_tables(_graph_index, data_source):
+    """
+    Zone, per-provider route and per-state postcode tables for the analytics
+    tab, built once per data source with pandas groupby instead of re-scanning
+    the graph on every rerun
+    """
+    provider_ids = list(_graph_index.providerZones)
+    zones_df = pd.DataFrame(
+        [(provider_id, zone.zoneCode, len(zone.postcodes), zone.state, zone.category)
+         for provider_id, zones in _graph_index.providerZones.items() for zone in zones],
+        columns=['Provider', 'Zone', 'Postcodes', 'State', 'Category'])
+    # Route columns come straight from the float32 RouteTable; providers are
+    # grouped on their interned ids
+    table = _graph_index.routeTable
+    routes_df = pd.DataFrame({
+        'providerId': table.providerId,
+        'baseCharge': table.baseCharge,
+        'minCharge': table.minCharge,
+        'reliabilityScore': table.reliabilityScore,
+    })
+
+    route_stats = routes_df.groupby('providerId').agg(
+        Routes=('baseCharge', 'size'),
+        AvgReliability=('reliabilityScore', 'mean'),
+        MinCharge=('minCharge', 'min'),
+        AvgBase=('baseCharge', 'mean'),
+    ).reindex([_graph_index.interner.get(p) for p in provider_ids], fill_value=0)
+    comparison = pd.DataFrame({
+        'Provider': provider_ids,
+        'Zones': zones_df.groupby('Provider').size().reindex(provider_ids, fill_value=0).to_numpy(),
+        'Routes': route_stats['Routes'].to_numpy(),
+        'Avg Reliability': route_stats['AvgReliability'].to_numpy(),
+        'Min Charge': route_stats['MinCharge'].to_numpy(),
+        'Avg Base Charge': route_stats['AvgBase'].to_numpy(),
+    })
+
+    states = pd.Series([pc.state for pc in _graph_index.postcodes.values()], name='State')
+    df_state = states.groupby(states, sort=False).size().rename('Count').reset_index()
+    return zones_df, comparison, df_state
+
 with tabs[2]:
     st.header("📊 Network Analytics")
+    zones_df, comparison, df_state = network_tables(graph_index, data_source)
 
     analytics_type = st.radio(
         "Select Analysis",
@@ -264,51 +320,18 @@ with tabs[2]:
     if analytics_type == "Zone Coverage":
         st.subheader("Zone Coverage by Provider")
 
-        for provider_id, zones in graph_index.providerZones.items():
-            total_pcs = sum(len(z.postcodes) for z in zones)
-            st.markdown(f"### {provider_id} ({len(zones)} zones, {total_pcs} postcodes)")
-
-            zone_data = []
-            for zone in zones:
-                zone_data.append({
-                    'Zone': zone.zoneCode,
-                    'Postcodes': len(zone.postcodes),
-                    'State': zone.state,
-                    'Category': zone.category
-                })
-            
-            st.dataframe(zone_data, use_container_width=True)
+        for provider_id, zone_data in zones_df.groupby('Provider', sort=False):
+            st.markdown(f"### {provider_id} ({len(zone_data)} zones, {zone_data['Postcodes'].sum()} postcodes)")
+            st.dataframe(zone_data.drop(columns='Provider').reset_index(drop=True), use_container_width=True)
 
     elif analytics_type == "Provider Comparision":
         st.subheader("Provider Network Metrics")
 
-        comparison = []
-        for provider_id, zones in graph_index.providerZones.items():
-            routes = graph_index.zoneRoutes.get(provider_id, [])
-            comparison.append({
-                'Provider': provider_id,
-                'Zones': len(zones),
-                'Routes': len(routes),
-                'Avg Reliability': sum(r.reliabilityScore for r in routes) / len(routes) if routes else 0,
-                'Min Charge': min((r.minCharge for r in routes), default=0),
-                'Avg Base Charge': sum(r.baseCharge for r in routes) / len(routes) if routes else 0
-            })
-        
         st.dataframe(comparison, use_container_width=True)
     
     else:
         st.subheader("Postcode Distribution by State")
 
-        state_dist = {}
-        for pc in graph_index.postcodes.values():
-            state = pc.state
-            if state not in state_dist:
-                state_dist[state] = 0
-            state_dist[state] += 1
-        
-        import pandas as pd
-        df_state = pd.DataFrame(list(state_dist.items()), columns=['State', 'Count'])
-
         col1, col2 = st.columns(2)
         with col1:
             st.dataframe(df_state, use_container_width=True)
@@ -0,0 +1,102 @@
+"""
+Search Engine Regression Script
+===============================
+Runs every sample postcode pair through the route engines on the in-memory
+PoC network (TerminusDBLoader.sample_data, no database needed) and checks:
+- single-shipment searches agree with and without the numba kernels
+- batch (shared-search) results match the single-shipment best path
+- engine.py and engine_new.py agree on the best path and on "no path"
+- no returned path exceeds maxCost/maxETD, repeats a node or is listed twice
+- tightening maxCost never hides a path that fits within it
+"""
+
+import itertools
+
+import engine
+import engine_new
+from data_loader import TerminusDBLoader
+from data_model import Shipment
+
+INF = float('inf')
+WEIGHTS = (0.0, 5.0, 120.0)
+MAX_COSTS = (INF, 200.0, 100.0, 50.0)
+MAX_ETDS = (INF, 20.0, 8.0)
+
+def _shipments():
+    _, postcodes, _, _, graph_index = TerminusDBLoader.sample_data()
+    codes = [pc.code for pc in postcodes]
+    shipments = [
+        Shipment(id=f"{origin}-{dest}-{w:g}", originPC=origin, destPC=dest, weightKG=w)
+        for origin, dest in itertools.permutations(codes, 2)
+        for w in WEIGHTS
+    ]
+    return graph_index, {pc.code: pc for pc in postcodes}, shipments
+
+def _best(paths):
+    return paths[0].totalCost if paths else None
+
+def _check_paths(shipment, paths, maxCost, maxETD):
+    """Every path fits the limits, is loop-free and distinct, cheapest first"""
+    for path in paths:
+        assert path.totalCost <= maxCost, f"{shipment.id}: cost {path.totalCost} over maxCost {maxCost}"
+        assert path.totalETD <= maxETD, f"{shipment.id}: ETD {path.totalETD} over maxETD {maxETD}"
+        assert len(set(path.nodes)) == len(path.nodes), f"{shipment.id}: path revisits a node"
+        assert abs(sum(seg['cost'] for seg in path.segments) - path.totalCost) < 1e-9, f"{shipment.id}: segment costs do not add up"
+    assert len({tuple(p.nodes) for p in paths}) == len(paths), f"{shipment.id}: duplicate paths"
+    assert [p.totalCost for p in paths] == sorted(p.totalCost for p in paths), f"{shipment.id}: paths not cheapest first"
+
+def _run(module, search_engine, shipments, maxCost, maxETD, compiled):
+    saved = module.NUMBA_AVAILABLE
+    module.NUMBA_AVAILABLE = compiled
+    try:
+        return [search_engine.find_mltihop_path(s, maxCost=maxCost, maxETD=maxETD) for s in shipments]
+    finally:
+        module.NUMBA_AVAILABLE = saved
+
+def test_engines():
+    graph_index, postcodes, shipments = _shipments()
+    engines = (
+        (engine, engine.BidirectionalAStarEngine(graph_index, postcodes)),
+        (engine_new, engine_new.FreightAStarEngine(graph_index, postcodes)),
+    )
+    modes = (False, True) if engine_new.NUMBA_AVAILABLE else (False,)
+
+    unlimited = None
+    for maxCost, maxETD in itertools.product(MAX_COSTS, MAX_ETDS):
+        results = {}
+        for (module, search_engine), compiled in itertools.product(engines, modes):
+            paths = _run(module, search_engine, shipments, maxCost, maxETD, compiled)
+            for shipment, found in zip(shipments, paths):
+                _check_paths(shipment, found, maxCost, maxETD)
+            results[module.__name__, compiled] = paths
+
+        # Same answers from the Python search and the compiled kernels
+        for module, _ in engines:
+            python_paths = results[module.__name__, False]
+            for compiled in modes[1:]:
+                for shipment, a, b in zip(shipments, python_paths, results[module.__name__, compiled]):
+                    assert [p.nodes for p in a] == [p.nodes for p in b], f"{module.__name__} {shipment.id}: compiled search differs"
+
+        reference = results['engine_new', False]
+        for shipment, a, b in zip(shipments, results['engine', False], reference):
+            assert _best(a) == _best(b), f"{shipment.id}: engines disagree ({_best(a)} vs {_best(b)})"
+
+        batch = engines[1][1].find_mltihop_paths(shipments, maxCost=maxCost, maxETD=maxETD)
+        for shipment, found, single in zip(shipments, batch, reference):
+            _check_paths(shipment, found, maxCost, maxETD)
+            # With a finite maxETD, the single-label searches may settle on different feasible paths
+            if maxETD == INF:
+                assert _best(found) == _best(single), f"{shipment.id}: batch {_best(found)} vs single {_best(single)}"
+
+        if maxCost == INF and maxETD == INF:
+            unlimited = [_best(paths) for paths in reference]
+        elif maxETD == INF:
+            for shipment, best, single in zip(shipments, unlimited, reference):
+                expected = best if best is not None and best <= maxCost else None
+                assert _best(single) == expected, f"{shipment.id}: maxCost {maxCost} gave {_best(single)}, expected {expected}"
+
+    print(f"✅ {len(shipments)} shipments x {len(MAX_COSTS) * len(MAX_ETDS)} limit pairs checked "
+          f"({'python + numba' if len(modes) > 1 else 'python only'})")
+
+if __name__ == "__main__":
+    test_engines()